@@ -5,9 +5,13 @@ BENCHMARK_TICKER = '^GSPC'
 
 # Database settings
 CACHE_ENABLED = True  # Set to False to disable caching
+VALIDATE_TICKERS = False  # Set to True to validate tickers on startup (one batched probe)
 DB_CLEANUP_DAYS = 7   # Keep hourly data for 7 days
 AUTO_CLEANUP_HOURLY = True  # Automatically clean old hourly data
 
+# Indicator engine settings
+USE_POLARS = False  # Use Polars (multi-threaded) for panel indicators if installed
+
 # Data refresh settings
 DAILY_DATA_STALE_HOURS = 18    # Consider daily data stale after 18 hours
 HOURLY_DATA_STALE_MINUTES = 60 # Consider hourly data stale after 1 hour
@@ -1,23 +1,244 @@
 # data/loader.py
 import yfinance as yf
+import numpy as np
 import sqlite3
+import atexit
+import functools
+import threading
+import hashlib
 import pandas as pd
+from pathlib import Path
 from datetime import datetime, timedelta
 import os
-from config import ASSETS_FILE, CURRENCIES_FILE
+from config import (
+    ASSETS_FILE, CURRENCIES_FILE, CACHE_ENABLED, VALIDATE_TICKERS,
+    DAILY_DATA_STALE_HOURS, HOURLY_DATA_STALE_MINUTES,
+    DB_CLEANUP_DAYS, AUTO_CLEANUP_HOURLY
+)
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import repeat
 import time
 
+# Copy-on-Write makes the shallow copies below safe: only columns that are
+# actually written get materialized (always on from pandas 3.0)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
 # Database configuration
 DB_PATH = "data/market_data.db"
 MAX_HOURLY_DAYS = 30  # Yahoo Finance limit for hourly data
 
+# Hot-path SQL as module constants: the same statement object keeps
+# hitting sqlite3's prepared-statement cache instead of being re-built
+# and re-parsed per ticker
+SQL_INSERT_DAILY = """
+    INSERT INTO daily_data
+    (ticker, date, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(ticker, date) DO UPDATE SET
+        open = excluded.open, high = excluded.high, low = excluded.low,
+        close = excluded.close, volume = excluded.volume
+"""
+SQL_INSERT_HOURLY = """
+    INSERT INTO hourly_data
+    (ticker, datetime, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(ticker, datetime) DO UPDATE SET
+        open = excluded.open, high = excluded.high, low = excluded.low,
+        close = excluded.close, volume = excluded.volume
+"""
+SQL_UPSERT_DAILY_META = """
+    INSERT INTO update_metadata (ticker, last_daily_update)
+    VALUES (?, (SELECT MAX(date) FROM daily_data WHERE ticker = ?))
+    ON CONFLICT(ticker) DO UPDATE SET
+        last_daily_update = excluded.last_daily_update
+"""
+SQL_UPSERT_HOURLY_META = """
+    INSERT INTO update_metadata (ticker, last_hourly_update)
+    VALUES (?, (SELECT MAX(datetime) FROM hourly_data WHERE ticker = ?))
+    ON CONFLICT(ticker) DO UPDATE SET
+        last_hourly_update = excluded.last_hourly_update
+"""
+# COALESCE lets the optional range bounds stay in one fixed SQL string, so
+# every call hits the connection's prepared-statement cache
+SQL_SELECT_DAILY = """
+    SELECT date, open, high, low, close, volume FROM daily_data
+    WHERE ticker = ? AND date >= COALESCE(?, date) AND date <= COALESCE(?, date)
+    ORDER BY date
+"""
+SQL_SELECT_HOURLY = """
+    SELECT datetime, open, high, low, close, volume FROM hourly_data
+    WHERE ticker = ? AND datetime >= COALESCE(?, datetime)
+        AND datetime <= COALESCE(?, datetime)
+    ORDER BY datetime
+"""
+
+# Parquet snapshot cache for whole download batches. Needs a parquet
+# engine; without one the cache is skipped quietly.
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PARQUET = True
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        _HAS_PARQUET = True
+    except ImportError:
+        _HAS_PARQUET = False
+
+BATCH_CACHE_DIR = ".cache"
+
+def _batch_cache_path(tickers, period, interval):
+    """Cache filename keyed by the sorted ticker list, period and interval."""
+    key = "|".join(sorted(tickers)) + f"|{period}|{interval}"
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return os.path.join(BATCH_CACHE_DIR, f"batch_{digest}.parquet")
+
+def _batch_cache_max_age(interval):
+    """Staleness window in seconds, reusing the config refresh settings."""
+    if interval == '1h':
+        return HOURLY_DATA_STALE_MINUTES * 60
+    return DAILY_DATA_STALE_HOURS * 3600
+
+def load_batch_cache(path, interval='1d'):
+    """Load a cached download batch if it exists and is fresh, else None."""
+    if not _HAS_PARQUET:
+        return None
+    try:
+        if not os.path.exists(path):
+            return None
+        if time.time() - os.path.getmtime(path) > _batch_cache_max_age(interval):
+            return None
+        flat = pd.read_parquet(path)
+    except Exception as e:
+        print(f"Warning: could not read batch cache {path}: {e}")
+        return None
+
+    # Columns are flattened as 'ticker|field'; rebuild one frame per ticker
+    per_ticker = {}
+    for col in flat.columns:
+        ticker, field = col.split('|', 1)
+        per_ticker.setdefault(ticker, {})[field] = flat[col]
+    return {ticker: pd.DataFrame(fields).dropna(how='all')
+            for ticker, fields in per_ticker.items()}
+
+def save_batch_cache(path, all_data):
+    """Persist a dict of per-ticker DataFrames as one flat parquet file."""
+    if not _HAS_PARQUET:
+        return
+    try:
+        os.makedirs(BATCH_CACHE_DIR, exist_ok=True)
+        flat = pd.DataFrame({
+            f"{ticker}|{field}": df[field]
+            for ticker, df in all_data.items()
+            for field in df.columns
+        })
+        flat.to_parquet(path)
+    except Exception as e:
+        print(f"Warning: could not write batch cache {path}: {e}")
+
+def _connect(readonly=False):
+    """Open a connection with the write-friendly PRAGMA recipe applied.
+
+    WAL + synchronous=NORMAL avoids a full fsync per transaction; the
+    cache/temp/mmap settings keep hot pages and sorts in memory. PRAGMAs
+    are per-connection (journal_mode persists), so every connection goes
+    through here. With readonly=True the connection opens in ro URI
+    mode, skipping write-lock bookkeeping entirely.
+    """
+    if readonly:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True,
+                               check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        return conn
+
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+    # Takes effect when the DB file is created (or after a manual VACUUM)
+    # and lets cleanup return freed pages via incremental_vacuum
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    return conn
+
+_DB_LOCK = threading.RLock()
+_CONN = None
+
+def _get_conn():
+    """Lazily created connection shared by the whole process.
+
+    Opening/closing a connection per call thrashes the .db/-wal/-shm
+    files when looping over many tickers; one reused connection (all DB
+    work is serialized under _DB_LOCK) avoids that.
+    """
+    global _CONN
+    with _DB_LOCK:
+        if _CONN is None:
+            _CONN = _connect()
+        return _CONN
+
+_RO_LOCK = threading.RLock()
+_RO_CONN = None
+
+def _get_ro_conn():
+    """Shared read-only companion to _get_conn, or None if unavailable.
+
+    Under WAL a reader on its own connection never waits on the writer,
+    so pure reads can run alongside an in-flight save. The read-only
+    open fails while the DB file doesn't exist yet; callers fall back
+    to the shared read-write connection then.
+    """
+    global _RO_CONN
+    with _RO_LOCK:
+        if _RO_CONN is None:
+            try:
+                _RO_CONN = _connect(readonly=True)
+            except sqlite3.Error:
+                return None
+        return _RO_CONN
+
+def _reader():
+    """Connection + lock pair for pure read paths."""
+    conn = _get_ro_conn()
+    if conn is not None:
+        return conn, _RO_LOCK
+    return _get_conn(), _DB_LOCK
+
+def _close_conn():
+    global _CONN, _RO_CONN
+    with _DB_LOCK:
+        if _CONN is not None:
+            _CONN.close()
+            _CONN = None
+    with _RO_LOCK:
+        if _RO_CONN is not None:
+            _RO_CONN.close()
+            _RO_CONN = None
+
+atexit.register(_close_conn)
+
+_DB_INITIALIZED = False
+
 def ensure_db_exists():
-    """Create database and tables if they don't exist."""
+    """Create database and tables if they don't exist.
+
+    Runs the DDL once per process; every later call is a cheap flag
+    check instead of re-issuing the CREATE statements per ticker.
+    """
+    global _DB_INITIALIZED
+    if _DB_INITIALIZED:
+        return
+
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
-    with sqlite3.connect(DB_PATH) as conn:
-        # Daily data table
+    conn = _get_conn()
+    with _DB_LOCK, conn:
+        # Daily data table. WITHOUT ROWID clusters rows on the composite
+        # PK, so range scans skip the rowid indirection (applies to
+        # freshly created DB files; existing ones keep their layout).
         conn.execute("""
                      CREATE TABLE IF NOT EXISTS daily_data (
                                                                ticker TEXT,
@@ -28,10 +249,11 @@ def ensure_db_exists():
                                                                close REAL,
                                                                volume INTEGER,
                                                                PRIMARY KEY (ticker, date)
-                         )
+                         ) WITHOUT ROWID
                      """)
 
-        # Hourly data table
+        # Hourly data table keeps its rowid: cleanup_old_hourly_data
+        # deletes in rowid chunks
         conn.execute("""
                      CREATE TABLE IF NOT EXISTS hourly_data (
                                                                 ticker TEXT,
@@ -51,7 +273,7 @@ def ensure_db_exists():
                                                                     ticker TEXT PRIMARY KEY,
                                                                     last_daily_update DATE,
                                                                     last_hourly_update DATETIME
-                     )
+                     ) WITHOUT ROWID
                      """)
 
         # NEW: Asset names cache table
@@ -61,12 +283,43 @@ def ensure_db_exists():
                                                                 long_name TEXT,
                                                                 short_name TEXT,
                                                                 last_updated DATE
-                     )
+                     ) WITHOUT ROWID
+                     """)
+
+        # Covering indexes: the ticker/date range loads return the full
+        # OHLCV row, so serving them from the index alone skips the table
+        # lookup per row. The plain datetime index supports time-based
+        # cleanup, which would otherwise scan the (ticker, datetime) PK.
+        conn.execute("""
+                     CREATE INDEX IF NOT EXISTS idx_daily_covering
+                         ON daily_data(ticker, date, open, high, low, close, volume)
+                     """)
+        conn.execute("""
+                     CREATE INDEX IF NOT EXISTS idx_hourly_covering
+                         ON hourly_data(ticker, datetime, open, high, low, close, volume)
+                     """)
+        conn.execute("""
+                     CREATE INDEX IF NOT EXISTS idx_hourly_datetime
+                         ON hourly_data(datetime)
+                     """)
+        conn.execute("""
+                     CREATE INDEX IF NOT EXISTS idx_asset_names_last_updated
+                         ON asset_names(last_updated)
                      """)
+        conn.execute("ANALYZE")
+
+    _DB_INITIALIZED = True
 
+@functools.lru_cache(maxsize=4096)
 def get_asset_name_from_cache(ticker):
-    """Get asset name from local cache."""
-    with sqlite3.connect(DB_PATH) as conn:
+    """Get asset name from local cache.
+
+    Memoized: repeat lookups during a session hit the in-process cache
+    instead of SQLite. Writers call cache_clear() after changing the
+    table so staleness stays bounded to one batch.
+    """
+    conn, lock = _reader()
+    with lock:
         result = conn.execute(
             "SELECT long_name, short_name FROM asset_names WHERE ticker = ?",
             (ticker,)
@@ -77,17 +330,77 @@ def get_asset_name_from_cache(ticker):
         return long_name or short_name or ticker
     return None
 
+def get_cached_asset_names(tickers):
+    """Fetch cached names for many tickers with one IN query.
+
+    Returns a dict of ticker -> display name; tickers without a cached
+    row are simply absent.
+    """
+    unique = list(dict.fromkeys(tickers))
+    if not unique:
+        return {}
+
+    placeholders = ",".join("?" * len(unique))
+    conn, lock = _reader()
+    with lock:
+        rows = conn.execute(
+            f"SELECT ticker, long_name, short_name FROM asset_names"
+            f" WHERE ticker IN ({placeholders})",
+            unique
+        ).fetchall()
+    return {ticker: (long_name or short_name or ticker)
+            for ticker, long_name, short_name in rows}
+
+class _RateLimiter:
+    """Hand out evenly spaced call slots across threads.
+
+    Enforcing the limit where the request is made lets workers overlap
+    network I/O right up to the limit, instead of the result-collection
+    loop sleeping after every future and serializing the pool.
+    """
+    def __init__(self, calls_per_second):
+        self._interval = 1.0 / calls_per_second
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# Keep name lookups under Yahoo's practical request rate
+_NAME_RATE_LIMITER = _RateLimiter(calls_per_second=2)
+
+def _fetch_name_fields(ticker_obj):
+    """Name fields via the light chart-metadata call, with .info fallback.
+
+    get_history_metadata hits the small chart endpoint; the full
+    quoteSummary payload behind .info is only pulled when the chart
+    metadata carries no name fields. Every HTTP call here takes a slot
+    from the shared rate limiter, so concurrent chunk workers stay under
+    Yahoo's request rate.
+    """
+    try:
+        _NAME_RATE_LIMITER.wait()
+        meta = ticker_obj.get_history_metadata()
+        long_name = (meta.get('longName') or '').strip()
+        short_name = (meta.get('shortName') or '').strip()
+        if long_name or short_name:
+            return long_name, short_name
+    except Exception:
+        pass
+    _NAME_RATE_LIMITER.wait()
+    info = ticker_obj.info
+    return (info.get('longName') or '').strip(), (info.get('shortName') or '').strip()
+
 def fetch_single_asset_name(ticker):
     """Fetch name for a single asset with error handling."""
     try:
         ticker_obj = yf.Ticker(ticker)
-        info = ticker_obj.info
-        long_name = info.get('longName', '')
-        short_name = info.get('shortName', '')
-
-        # Clean up names - remove extra whitespace and handle None values
-        long_name = long_name.strip() if long_name else ''
-        short_name = short_name.strip() if short_name else ''
+        long_name, short_name = _fetch_name_fields(ticker_obj)
 
         return {
             'ticker': ticker,
@@ -104,14 +417,52 @@ def fetch_single_asset_name(ticker):
             'success': False
         }
 
-def batch_update_asset_names(tickers, max_workers=5, delay_between_requests=0.1):
+def fetch_asset_names_chunk(tickers):
+    """Fetch names for a chunk of tickers through one yf.Tickers session.
+
+    The chunk shares a single HTTP session (one TLS handshake) instead
+    of building a fresh yf.Ticker per symbol; tickers that the batch
+    object cannot resolve fall back to the single fetch.
+    """
+    try:
+        ticker_objs = yf.Tickers(" ".join(tickers)).tickers
+    except Exception as e:
+        print(f"Warning: batch name lookup failed for {len(tickers)} tickers: {e}")
+        return [fetch_single_asset_name(t) for t in tickers]
+
+    results = []
+    for ticker in tickers:
+        ticker_obj = ticker_objs.get(ticker.upper()) or ticker_objs.get(ticker)
+        if ticker_obj is None:
+            results.append(fetch_single_asset_name(ticker))
+            continue
+        try:
+            long_name, short_name = _fetch_name_fields(ticker_obj)
+            results.append({
+                'ticker': ticker,
+                'long_name': long_name,
+                'short_name': short_name,
+                'success': True
+            })
+        except Exception as e:
+            print(f"Warning: Could not fetch name for {ticker}: {e}")
+            results.append({
+                'ticker': ticker,
+                'long_name': '',
+                'short_name': '',
+                'success': False
+            })
+    return results
+
+def batch_update_asset_names(tickers, max_workers=4, chunk_size=50):
     """
     Efficiently fetch and cache asset names for multiple tickers.
 
     Args:
         tickers: List of ticker symbols
-        max_workers: Number of concurrent threads (keep low to avoid rate limiting)
-        delay_between_requests: Delay between requests to avoid rate limiting
+        max_workers: Number of chunks fetched concurrently (the shared
+            rate limiter keeps the request rate under Yahoo's limit)
+        chunk_size: Tickers per yf.Tickers batch request
     """
     ensure_db_exists()
 
@@ -119,7 +470,8 @@ def batch_update_asset_names(tickers, max_workers=5, delay_between_requests=0.1)
     tickers_to_fetch = []
     cached_count = 0
 
-    with sqlite3.connect(DB_PATH) as conn:
+    conn = _get_conn()
+    with _DB_LOCK, conn:
         for ticker in tickers:
             result = conn.execute(
                 """SELECT last_updated FROM asset_names
@@ -141,43 +493,44 @@ def batch_update_asset_names(tickers, max_workers=5, delay_between_requests=0.1)
 
     print(f"Fetching names for {len(tickers_to_fetch)} tickers...")
 
-    # Fetch names with controlled concurrency
+    # Fetch chunk-by-chunk with controlled concurrency: each chunk is one
+    # batched yf.Tickers request instead of a connection per symbol
+    chunks = [tickers_to_fetch[i:i + chunk_size]
+              for i in range(0, len(tickers_to_fetch), chunk_size)]
     results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all requests
-        future_to_ticker = {
-            executor.submit(fetch_single_asset_name, ticker): ticker
-            for ticker in tickers_to_fetch
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        future_to_chunk = {
+            executor.submit(fetch_asset_names_chunk, chunk): chunk
+            for chunk in chunks
         }
 
         # Process results as they complete
-        for future in as_completed(future_to_ticker):
-            ticker = future_to_ticker[future]
+        for future in as_completed(future_to_chunk):
+            chunk = future_to_chunk[future]
             try:
-                result = future.result()
-                results.append(result)
-
-                # Small delay to be respectful to the API
-                time.sleep(delay_between_requests)
+                results.extend(future.result())
 
             except Exception as e:
-                print(f"Error fetching name for {ticker}: {e}")
-                results.append({
+                print(f"Error fetching names for chunk of {len(chunk)} tickers: {e}")
+                results.extend({
                     'ticker': ticker,
                     'long_name': '',
                     'short_name': '',
                     'success': False
-                })
+                } for ticker in chunk)
 
-    # Save results to database
+    # Save all results in one executemany / one transaction
     today = datetime.now().date()
-    with sqlite3.connect(DB_PATH) as conn:
-        for result in results:
-            conn.execute("""
-                INSERT OR REPLACE INTO asset_names 
-                (ticker, long_name, short_name, last_updated)
-                VALUES (?, ?, ?, ?)
-            """, (result['ticker'], result['long_name'], result['short_name'], today))
+    conn = _get_conn()
+    with _DB_LOCK, conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO asset_names
+            (ticker, long_name, short_name, last_updated)
+            VALUES (?, ?, ?, ?)
+        """, [(r['ticker'], r['long_name'], r['short_name'], today) for r in results])
+
+    # Drop memoized lookups so they see the fresh rows
+    get_asset_name_from_cache.cache_clear()
 
     successful_fetches = sum(1 for r in results if r['success'])
     print(f"Successfully fetched and cached {successful_fetches}/{len(results)} asset names")
@@ -208,11 +561,9 @@ def get_asset_names_for_dataframe(df):
     # Ensure we have cached names for all tickers
     batch_update_asset_names(tickers)
 
-    # Get names from cache
-    names = []
-    for ticker in tickers:
-        cached_name = get_asset_name_from_cache(ticker)
-        names.append(cached_name or ticker)  # Fallback to ticker if no name found
+    # Get names from cache in one query; fall back to the ticker itself
+    name_map = get_cached_asset_names(tickers)
+    names = [name_map.get(ticker, ticker) for ticker in tickers]
 
     # Add names to dataframe
     if ticker_column_exists:
@@ -240,32 +591,68 @@ def preload_asset_names(assets_file=None, currencies_file=None):
     assets_file = assets_file or ASSETS_FILE
     currencies_file = currencies_file or CURRENCIES_FILE
 
-    all_tickers = []
+    # Collect into a set: symbols listed in both files would otherwise
+    # cost a duplicate HTTP lookup each
+    all_tickers = set()
 
     # Load assets
     if os.path.exists(assets_file):
-        with open(assets_file) as f:
-            assets = [line.strip() for line in f if line.strip()]
-            all_tickers.extend(assets)
-            print(f"Loaded {len(assets)} assets from {assets_file}")
+        assets = read_tickers(assets_file)
+        all_tickers.update(assets)
+        print(f"Loaded {len(assets)} assets from {assets_file}")
 
     # Load currencies
     if os.path.exists(currencies_file):
-        with open(currencies_file) as f:
-            currencies = [line.strip() for line in f if line.strip()]
-            all_tickers.extend(currencies)
-            print(f"Loaded {len(currencies)} currencies from {currencies_file}")
+        currencies = read_tickers(currencies_file)
+        all_tickers.update(currencies)
+        print(f"Loaded {len(currencies)} currencies from {currencies_file}")
 
     if all_tickers:
         print(f"Preloading names for {len(all_tickers)} tickers...")
-        batch_update_asset_names(all_tickers)
+        batch_update_asset_names(sorted(all_tickers))
         print("Name preloading complete!")
     else:
         print("No tickers found to preload")
 
+def cleanup_old_hourly_data(days_to_keep=None):
+    """Delete hourly rows older than the retention window.
+
+    Deletes run in rowid chunks so each transaction (and the WAL) stays
+    small, using idx_hourly_datetime to find old rows without scanning
+    the (ticker, datetime) primary key; incremental vacuum then hands
+    the freed pages back instead of leaving the file bloated.
+    """
+    if days_to_keep is None:
+        days_to_keep = DB_CLEANUP_DAYS
+    ensure_db_exists()
+
+    cutoff = (datetime.now() - timedelta(days=days_to_keep)).strftime('%Y-%m-%dT%H:%M:%S')
+    chunk_size = 10000
+    deleted_count = 0
+
+    conn = _get_conn()
+    while True:
+        with _DB_LOCK, conn:
+            deleted = conn.execute("""
+                DELETE FROM hourly_data WHERE rowid IN (
+                    SELECT rowid FROM hourly_data WHERE datetime < ? LIMIT ?
+                )
+            """, (cutoff, chunk_size)).rowcount
+        deleted_count += deleted
+        if deleted < chunk_size:
+            break
+
+    with _DB_LOCK, conn:
+        conn.execute("PRAGMA incremental_vacuum")
+
+    if deleted_count:
+        print(f"Cleaned up {deleted_count} old hourly records")
+    return deleted_count
+
 def cleanup_old_name_cache(days_to_keep=30):
     """Clean up old cached names."""
-    with sqlite3.connect(DB_PATH) as conn:
+    conn = _get_conn()
+    with _DB_LOCK, conn:
         cutoff_date = datetime.now().date() - timedelta(days=days_to_keep)
         deleted_count = conn.execute(
             "DELETE FROM asset_names WHERE last_updated < ?",
@@ -273,12 +660,16 @@ def cleanup_old_name_cache(days_to_keep=30):
         ).rowcount
         print(f"Cleaned up {deleted_count} old cached asset names")
 
+    # Drop memoized lookups that may point at deleted rows
+    get_asset_name_from_cache.cache_clear()
+
 # Keep all existing functions from the original loader.py...
 # [All the previous functions remain the same]
 
 def get_last_update_date(ticker, data_type='daily'):
     """Get the last update date for a ticker."""
-    with sqlite3.connect(DB_PATH) as conn:
+    conn, lock = _reader()
+    with lock:
         if data_type == 'daily':
             result = conn.execute(
                 "SELECT last_daily_update FROM update_metadata WHERE ticker = ?",
@@ -294,25 +685,48 @@ def get_last_update_date(ticker, data_type='daily'):
         return pd.to_datetime(result[0])
     return None
 
-def save_daily_data(ticker, df):
-    """Save daily data to SQLite database."""
+def get_all_last_updates(data_type='daily'):
+    """Get last update times for every ticker in a single query.
+
+    Batch downloads preload this dict once instead of paying one metadata
+    SELECT per ticker.
+    """
+    column = 'last_daily_update' if data_type == 'daily' else 'last_hourly_update'
+    conn, lock = _reader()
+    with lock:
+        rows = conn.execute(f"SELECT ticker, {column} FROM update_metadata").fetchall()
+    return {ticker: pd.to_datetime(value) for ticker, value in rows if value}
+
+def _flatten_columns(df):
+    """Collapse yfinance MultiIndex columns to their metric names.
+
+    One C-level get_level_values call instead of a per-column isinstance
+    comprehension.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    return df
+
+def save_daily_data(ticker, df, conn=None):
+    """Save daily data to SQLite database.
+
+    With `conn` given the caller owns the transaction (and already holds
+    _DB_LOCK); otherwise the write commits on its own.
+    """
     if df.empty:
         return
 
-    # Handle MultiIndex columns from yfinance
-    df_copy = df.copy()
+    # Handle MultiIndex columns from yfinance. Shallow copy: CoW only
+    # materializes the columns we actually modify.
+    df_copy = df.copy(deep=False)
 
-    # Check if we have MultiIndex columns
-    if isinstance(df_copy.columns, pd.MultiIndex):
-        # Flatten MultiIndex columns - take the first level (metric name)
-        df_copy.columns = [col[0] if isinstance(col, tuple) else col for col in df_copy.columns]
+    _flatten_columns(df_copy)
 
     # Reset index to get Date as a column
-    if isinstance(df_copy.index, pd.DatetimeIndex):
-        df_copy.reset_index(inplace=True)
+    df_copy = df_copy.reset_index()
+    if isinstance(df.index, pd.DatetimeIndex):
         date_col = 'Date'
     else:
-        df_copy.reset_index(inplace=True)
         date_col = df_copy.columns[0]  # First column should be date
 
     # Ensure we have the required columns
@@ -323,9 +737,12 @@ def save_daily_data(ticker, df):
         print(f"Available columns: {list(df_copy.columns)}")
         return
 
-    # Add ticker and convert date
-    df_copy['ticker'] = ticker
-    df_copy['date'] = pd.to_datetime(df_copy[date_col]).dt.date
+    # Convert date; yfinance already hands us datetime64, so only fall
+    # back to parsing for anything else
+    dates = df_copy[date_col]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, cache=True)
+    df_copy['date'] = dates.dt.date
 
     # Select and rename columns to match DB schema
     columns_map = {
@@ -335,7 +752,7 @@ def save_daily_data(ticker, df):
     df_copy = df_copy.rename(columns=columns_map)
 
     # Ensure we have the columns we need
-    final_cols = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume']
+    final_cols = ['date', 'open', 'high', 'low', 'close', 'volume']
     df_copy = df_copy[final_cols]
 
     # Remove any rows with NaN values in critical columns
@@ -345,54 +762,56 @@ def save_daily_data(ticker, df):
         print(f"Warning: No valid data to save for {ticker}")
         return
 
-    with sqlite3.connect(DB_PATH) as conn:
-        # Use INSERT OR REPLACE for upsert behavior
-        for _, row in df_copy.iterrows():
-            # Convert all values to Python native types, handling NaN properly
-            values = (
-                str(row['ticker']),
-                row['date'],
-                float(row['open']),
-                float(row['high']),
-                float(row['low']),
-                float(row['close']),
-                int(row['volume']) if pd.notna(row['volume']) and row['volume'] != 0 else 0
-            )
-
-            conn.execute("""
-                INSERT OR REPLACE INTO daily_data 
-                (ticker, date, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, values)
+    # Coerce whole columns to 1D NumPy arrays once instead of per-row
+    # float()/int() casts; the NumPy scalars bind directly in sqlite3.
+    # The ticker is a constant, so repeat the one interned str instead of
+    # materializing a whole column of it.
+    rows = list(zip(
+        repeat(ticker),
+        df_copy['date'].tolist(),
+        df_copy['open'].to_numpy(dtype='float64'),
+        df_copy['high'].to_numpy(dtype='float64'),
+        df_copy['low'].to_numpy(dtype='float64'),
+        df_copy['close'].to_numpy(dtype='float64'),
+        # np.int64 binds as a blob, so volume stays a Python-int list
+        df_copy['volume'].fillna(0).astype('int64').tolist(),
+    ))
+
+    # The metadata timestamp comes from MAX(date) inside the same
+    # statement/transaction, so it always matches what was written
+    if conn is not None:
+        # One executemany inside the caller's transaction (metadata included)
+        conn.executemany(SQL_INSERT_DAILY, rows)
+        conn.execute(SQL_UPSERT_DAILY_META, (ticker, ticker))
+    else:
+        conn = _get_conn()
+        with _DB_LOCK, conn:
+            # One executemany in a single transaction (metadata update included)
+            conn.executemany(SQL_INSERT_DAILY, rows)
+            conn.execute(SQL_UPSERT_DAILY_META, (ticker, ticker))
 
-        # Update metadata
-        last_date = df_copy['date'].max()
-        conn.execute("""
-            INSERT OR REPLACE INTO update_metadata (ticker, last_daily_update)
-            VALUES (?, ?)
-        """, (ticker, last_date))
+    print(f"Saved {len(df_copy)} records for {ticker}")
 
-        print(f"Saved {len(df_copy)} records for {ticker}")
+def save_hourly_data(ticker, df, conn=None):
+    """Save hourly data to SQLite database.
 
-def save_hourly_data(ticker, df):
-    """Save hourly data to SQLite database."""
+    With `conn` given the caller owns the transaction (and already holds
+    _DB_LOCK); otherwise the write commits on its own.
+    """
     if df.empty:
         return
 
-    # Handle MultiIndex columns from yfinance
-    df_copy = df.copy()
+    # Handle MultiIndex columns from yfinance. Shallow copy: CoW only
+    # materializes the columns we actually modify.
+    df_copy = df.copy(deep=False)
 
-    # Check if we have MultiIndex columns
-    if isinstance(df_copy.columns, pd.MultiIndex):
-        # Flatten MultiIndex columns - take the first level (metric name)
-        df_copy.columns = [col[0] if isinstance(col, tuple) else col for col in df_copy.columns]
+    _flatten_columns(df_copy)
 
     # Reset index to get Datetime as a column
-    if isinstance(df_copy.index, pd.DatetimeIndex):
-        df_copy.reset_index(inplace=True)
+    df_copy = df_copy.reset_index()
+    if isinstance(df.index, pd.DatetimeIndex):
         datetime_col = 'Datetime' if 'Datetime' in df_copy.columns else df_copy.columns[0]
     else:
-        df_copy.reset_index(inplace=True)
         datetime_col = df_copy.columns[0]  # First column should be datetime
 
     # Ensure we have the required columns
@@ -403,9 +822,12 @@ def save_hourly_data(ticker, df):
         print(f"Available columns: {list(df_copy.columns)}")
         return
 
-    # Add ticker and convert datetime
-    df_copy['ticker'] = ticker
-    df_copy['datetime'] = pd.to_datetime(df_copy[datetime_col])
+    # Convert datetime; yfinance already hands us datetime64, so only
+    # fall back to parsing for anything else
+    datetimes = df_copy[datetime_col]
+    if not pd.api.types.is_datetime64_any_dtype(datetimes):
+        datetimes = pd.to_datetime(datetimes, cache=True)
+    df_copy['datetime'] = datetimes
 
     # Select and rename columns to match DB schema
     columns_map = {
@@ -415,7 +837,7 @@ def save_hourly_data(ticker, df):
     df_copy = df_copy.rename(columns=columns_map)
 
     # Ensure we have the columns we need
-    final_cols = ['ticker', 'datetime', 'open', 'high', 'low', 'close', 'volume']
+    final_cols = ['datetime', 'open', 'high', 'low', 'close', 'volume']
     df_copy = df_copy[final_cols]
 
     # Remove any rows with NaN values in critical columns
@@ -425,97 +847,136 @@ def save_hourly_data(ticker, df):
         print(f"Warning: No valid data to save for {ticker}")
         return
 
-    with sqlite3.connect(DB_PATH) as conn:
-        # Use INSERT OR REPLACE for upsert behavior
-        for _, row in df_copy.iterrows():
-            # Convert all values to Python native types, handling NaN properly
-            values = (
-                str(row['ticker']),
-                row['datetime'].isoformat(),
-                float(row['open']),
-                float(row['high']),
-                float(row['low']),
-                float(row['close']),
-                int(row['volume']) if pd.notna(row['volume']) and row['volume'] != 0 else 0
-            )
-
-            conn.execute("""
-                INSERT OR REPLACE INTO hourly_data 
-                (ticker, datetime, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, values)
-
-        # Update metadata
-        last_datetime = df_copy['datetime'].max()
-        conn.execute("""
-            INSERT OR REPLACE INTO update_metadata (ticker, last_hourly_update)
-            VALUES (?, ?)
-        """, (ticker, last_datetime.isoformat()))
-
-        print(f"Saved {len(df_copy)} hourly records for {ticker}")
-
-def load_daily_data_from_db(ticker, start_date=None, end_date=None):
-    """Load daily data from SQLite database."""
-    with sqlite3.connect(DB_PATH) as conn:
-        query = "SELECT date, open, high, low, close, volume FROM daily_data WHERE ticker = ?"
-        params = [ticker]
+    # Coerce whole columns to 1D NumPy arrays once instead of per-row
+    # float()/int()/isoformat calls. np.datetime_as_string formats the
+    # whole column in C, roughly an order of magnitude faster than
+    # .dt.strftime.
+    datetimes = df_copy['datetime']
+    if datetimes.dt.tz is not None:
+        datetimes = datetimes.dt.tz_localize(None)
+    iso_datetimes = np.datetime_as_string(
+        datetimes.to_numpy().astype('datetime64[s]'), unit='s'
+    ).tolist()
+
+    # The ticker is a constant, so repeat the one interned str instead of
+    # materializing a whole column of it
+    rows = list(zip(
+        repeat(ticker),
+        iso_datetimes,
+        df_copy['open'].to_numpy(dtype='float64'),
+        df_copy['high'].to_numpy(dtype='float64'),
+        df_copy['low'].to_numpy(dtype='float64'),
+        df_copy['close'].to_numpy(dtype='float64'),
+        # np.int64 binds as a blob, so volume stays a Python-int list
+        df_copy['volume'].fillna(0).astype('int64').tolist(),
+    ))
+
+    # The metadata timestamp comes from MAX(datetime) inside the same
+    # statement/transaction, so it always matches what was written
+    if conn is not None:
+        # One executemany inside the caller's transaction (metadata included)
+        conn.executemany(SQL_INSERT_HOURLY, rows)
+        conn.execute(SQL_UPSERT_HOURLY_META, (ticker, ticker))
+    else:
+        conn = _get_conn()
+        with _DB_LOCK, conn:
+            # One executemany in a single transaction (metadata update included)
+            conn.executemany(SQL_INSERT_HOURLY, rows)
+            conn.execute(SQL_UPSERT_HOURLY_META, (ticker, ticker))
 
-        if start_date:
-            query += " AND date >= ?"
-            params.append(start_date)
-        if end_date:
-            query += " AND date <= ?"
-            params.append(end_date)
+    print(f"Saved {len(df_copy)} hourly records for {ticker}")
 
-        query += " ORDER BY date"
+def load_daily_data_from_db(ticker, start_date=None, end_date=None, conn=None):
+    """Load daily data from SQLite database.
 
-        df = pd.read_sql_query(query, conn, params=params)
+    With `conn` given the read runs inside the caller's transaction.
+    """
+    params = (ticker, start_date or None, end_date or None)
 
-        if df.empty:
-            print(f"No cached data found for {ticker}")
-            return pd.DataFrame()
+    if conn is None:
+        conn, lock = _reader()
+    else:
+        lock = _DB_LOCK
+    with lock:
+        # Let the C parser build the DatetimeIndex directly instead of a
+        # to_datetime + set_index + drop sequence afterwards
+        df = pd.read_sql_query(
+            SQL_SELECT_DAILY, conn, params=params,
+            parse_dates={'date': {'format': '%Y-%m-%d'}},
+            index_col='date',
+            dtype={'open': 'float32', 'high': 'float32', 'low': 'float32',
+                   'close': 'float32', 'volume': 'int64'},
+        )
 
-        # Convert to the format expected by your existing code
-        df['Date'] = pd.to_datetime(df['date'])
-        df.set_index('Date', inplace=True)
-        df = df.drop('date', axis=1)
+    if df.empty:
+        print(f"No cached data found for {ticker}")
+        return pd.DataFrame()
 
-        # Capitalize column names to match yfinance format
-        df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    # Capitalize names to match yfinance format (rename by name, not
+    # position, so column-order changes can't mislabel anything)
+    df.index.name = 'Date'
+    df = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low',
+                            'close': 'Close', 'volume': 'Volume'})
 
-        print(f"Loaded {len(df)} cached records for {ticker}")
-        return df
+    print(f"Loaded {len(df)} cached records for {ticker}")
+    return df
 
-def load_hourly_data_from_db(ticker, start_datetime=None, end_datetime=None):
-    """Load hourly data from SQLite database."""
-    with sqlite3.connect(DB_PATH) as conn:
-        query = "SELECT datetime, open, high, low, close, volume FROM hourly_data WHERE ticker = ?"
-        params = [ticker]
+def load_hourly_data_from_db(ticker, start_datetime=None, end_datetime=None, conn=None):
+    """Load hourly data from SQLite database.
 
-        if start_datetime:
-            query += " AND datetime >= ?"
-            params.append(start_datetime)
-        if end_datetime:
-            query += " AND datetime <= ?"
-            params.append(end_datetime)
+    With `conn` given the read runs inside the caller's transaction.
+    """
+    # Bind datetime bounds in the stored text format; sqlite3's default
+    # adapter uses a space separator, which never matches the ISO 'T' rows
+    def _iso(dt):
+        return dt.strftime('%Y-%m-%dT%H:%M:%S') if isinstance(dt, datetime) else (dt or None)
 
-        query += " ORDER BY datetime"
+    params = (ticker, _iso(start_datetime), _iso(end_datetime))
 
-        df = pd.read_sql_query(query, conn, params=params)
+    if conn is None:
+        conn, lock = _reader()
+    else:
+        lock = _DB_LOCK
+    with lock:
+        try:
+            # Let the C parser build the DatetimeIndex directly instead of a
+            # to_datetime + set_index + drop sequence afterwards
+            df = pd.read_sql_query(
+                SQL_SELECT_HOURLY, conn, params=params,
+                parse_dates={'datetime': {'format': '%Y-%m-%dT%H:%M:%S'}},
+                index_col='datetime',
+                dtype={'open': 'float32', 'high': 'float32', 'low': 'float32',
+                       'close': 'float32', 'volume': 'int64'},
+            )
+        except ValueError:
+            # Rows written before the naive-ISO save path carry a UTC
+            # offset suffix (tz-aware Timestamp.isoformat()). Keep the
+            # wall time by parsing the first 19 chars instead of failing
+            # the whole read until those rows age out.
+            df = pd.read_sql_query(
+                SQL_SELECT_HOURLY, conn, params=params,
+                index_col='datetime',
+                dtype={'open': 'float32', 'high': 'float32', 'low': 'float32',
+                       'close': 'float32', 'volume': 'int64'},
+            )
+            df.index = pd.to_datetime(df.index.str.slice(0, 19),
+                                      format='%Y-%m-%dT%H:%M:%S')
 
-        if not df.empty:
-            df['Datetime'] = pd.to_datetime(df['datetime'])
-            df.set_index('Datetime', inplace=True)
-            df = df.drop('datetime', axis=1)
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    if not df.empty:
+        df.index.name = 'Datetime'
+        df = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low',
+                                'close': 'Close', 'volume': 'Volume'})
 
-        return df
+    return df
 
-def download_incremental_daily_data(ticker, period='15mo'):
+def download_incremental_daily_data(ticker, period='15mo', last_updates=None):
     """Download only new daily data since last update."""
     ensure_db_exists()
 
-    last_update = get_last_update_date(ticker, 'daily')
+    if last_updates is not None:
+        last_update = last_updates.get(ticker)
+    else:
+        last_update = get_last_update_date(ticker, 'daily')
 
     if last_update is None:
         # First time download - get full period
@@ -532,13 +993,9 @@ def download_incremental_daily_data(ticker, period='15mo'):
             # Save to database
             save_daily_data(ticker, data)
 
-            # Return properly formatted data (load from DB to ensure consistent format)
-            formatted_data = load_daily_data_from_db(ticker)
-            if not formatted_data.empty:
-                return formatted_data
-            else:
-                # Fallback: format the data manually if DB load fails
-                return format_yfinance_data(data)
+            # The full period is already in memory; format it directly
+            # instead of re-reading the whole history back from the DB
+            return format_yfinance_data(data)
 
         except Exception as e:
             print(f"Error downloading {ticker}: {e}")
@@ -559,11 +1016,22 @@ def download_incremental_daily_data(ticker, period='15mo'):
 
     try:
         new_data = yf.download(ticker, start=start_date, interval='1d', auto_adjust=True)
-        if not new_data.empty:
-            save_daily_data(ticker, new_data)
-
-        # Return full dataset from DB
-        return load_daily_data_from_db(ticker)
+        if new_data.empty:
+            return load_daily_data_from_db(ticker)
+
+        # Fence the write and the read-back of the merged history in one
+        # BEGIN IMMEDIATE transaction on the shared connection
+        conn = _get_conn()
+        with _DB_LOCK:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                save_daily_data(ticker, new_data, conn=conn)
+                result = load_daily_data_from_db(ticker, conn=conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return result
     except Exception as e:
         print(f"Error updating {ticker}: {e}")
         return load_daily_data_from_db(ticker)
@@ -573,12 +1041,10 @@ def format_yfinance_data(data):
     if data.empty:
         return pd.DataFrame()
 
-    df = data.copy()
+    df = data.copy(deep=False)
 
     # Handle MultiIndex columns
-    if isinstance(df.columns, pd.MultiIndex):
-        # Flatten MultiIndex columns - take the first level (metric name)
-        df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
+    _flatten_columns(df)
 
     # Ensure we have the expected columns
     expected_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
@@ -598,9 +1064,14 @@ def format_yfinance_data(data):
     # Select only the columns we need
     df = df[expected_cols]
 
+    # Narrow the price columns: float32 keeps >7 significant digits,
+    # plenty for quotes, and halves the in-memory footprint of large
+    # batches. Volume stays 64-bit since heavy tickers overflow int32.
+    df = df.astype({col: 'float32' for col in ['Open', 'High', 'Low', 'Close']})
+
     return df
 
-def download_incremental_hourly_data(ticker, hours_back=24):
+def download_incremental_hourly_data(ticker, hours_back=24, last_updates=None):
     """Download hourly data for the last N hours."""
     ensure_db_exists()
 
@@ -609,7 +1080,10 @@ def download_incremental_hourly_data(ticker, hours_back=24):
         print(f"Warning: Yahoo Finance limits hourly data to ~{MAX_HOURLY_DAYS} days")
         hours_back = 24 * MAX_HOURLY_DAYS
 
-    last_update = get_last_update_date(ticker, 'hourly')
+    if last_updates is not None:
+        last_update = last_updates.get(ticker)
+    else:
+        last_update = get_last_update_date(ticker, 'hourly')
     current_time = datetime.now()
 
     if last_update is None:
@@ -638,14 +1112,36 @@ def download_incremental_hourly_data(ticker, hours_back=24):
 
         new_data = yf.download(ticker, period=period, interval='1h', auto_adjust=True)
 
+        cutoff_time = current_time - timedelta(hours=hours_back)
+
         if not new_data.empty:
             # Format data before saving
             formatted_data = format_yfinance_data(new_data)
             if not formatted_data.empty:
-                save_hourly_data(ticker, formatted_data)
+                if last_update is None:
+                    # First download covers the whole requested window, so
+                    # skip the round trip back through the DB
+                    save_hourly_data(ticker, formatted_data)
+                    return formatted_data
+
+                # Fence the write and the read-back of the merged window
+                # in one BEGIN IMMEDIATE transaction
+                conn = _get_conn()
+                with _DB_LOCK:
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        save_hourly_data(ticker, formatted_data, conn=conn)
+                        result = load_hourly_data_from_db(ticker, start_datetime=cutoff_time, conn=conn)
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                if result.empty:
+                    # Fallback to formatted fresh data if DB load fails
+                    return formatted_data
+                return result
 
         # Return only the requested time window
-        cutoff_time = current_time - timedelta(hours=hours_back)
         result = load_hourly_data_from_db(ticker, start_datetime=cutoff_time)
 
         if result.empty and not new_data.empty:
@@ -659,6 +1155,32 @@ def download_incremental_hourly_data(ticker, hours_back=24):
         cutoff_time = current_time - timedelta(hours=hours_back)
         return load_hourly_data_from_db(ticker, start_datetime=cutoff_time)
 
+def _ticker_variants(ticker):
+    """Common alternate symbols for a ticker (European exchange suffix quirks)."""
+    if '.' in ticker:
+        base_ticker = ticker.split('.')[0]
+        variants = [base_ticker]
+        if ticker.endswith('.BD'):
+            variants.extend([f"{base_ticker}.BU", f"{base_ticker}.VI"])
+        elif ticker.endswith('.BU'):
+            variants.extend([f"{base_ticker}.BD", f"{base_ticker}.VI"])
+        return variants
+    return [f"{ticker}.BD", f"{ticker}.BU", f"{ticker}.VI"]
+
+def _probe_tickers(tickers):
+    """Download 5 days for all tickers in one call; return the set with data."""
+    found = set()
+    probe = yf.download(tickers, period='5d', interval='1d',
+                        group_by='ticker', threads=True, auto_adjust=True)
+    for ticker in tickers:
+        try:
+            frame = probe[ticker] if isinstance(probe.columns, pd.MultiIndex) else probe
+            if not frame.dropna(how='all').empty:
+                found.add(ticker)
+        except KeyError:
+            continue
+    return found
+
 def validate_ticker(ticker):
     """
     Validate if a ticker exists and suggest corrections for common issues.
@@ -670,63 +1192,107 @@ def validate_ticker(ticker):
         if not test_data.empty:
             return True, ticker, None
 
-        # Common ticker format issues for European stocks
-        suggestions = []
-
-        if '.' in ticker:
-            # Try without extension
-            base_ticker = ticker.split('.')[0]
-            suggestions.append(base_ticker)
-
-            # Try common European exchange suffixes
-            if ticker.endswith('.BD'):
-                suggestions.extend([f"{base_ticker}.BU", f"{base_ticker}.VI"])
-            elif ticker.endswith('.BU'):
-                suggestions.extend([f"{base_ticker}.BD", f"{base_ticker}.VI"])
-        else:
-            # Try adding common suffixes
-            suggestions.extend([f"{ticker}.BD", f"{ticker}.BU", f"{ticker}.VI"])
-
-        # Test suggestions
+        # One bulk download probes every common variant at once
+        suggestions = _ticker_variants(ticker)
+        found = _probe_tickers(suggestions)
         for suggestion in suggestions:
-            try:
-                test_data = yf.download(suggestion, period='5d', interval='1d', auto_adjust=True)
-                if not test_data.empty:
-                    return True, suggestion, f"Ticker corrected from {ticker} to {suggestion}"
-            except:
-                continue
+            if suggestion in found:
+                return True, suggestion, f"Ticker corrected from {ticker} to {suggestion}"
 
         return False, ticker, f"No valid data found for {ticker} or common variations"
 
     except Exception as e:
         return False, ticker, f"Error validating {ticker}: {e}"
 
+def validate_tickers(tickers):
+    """
+    Validate many tickers with a single batched probe download.
+
+    One yf.download call (yfinance parallelizes internally) replaces the
+    per-ticker probes; the suffix variants of whatever comes back empty
+    are then probed together in a second bulk call, so the whole assets
+    file validates in at most two downloads.
+
+    Returns (validated_tickers, messages): validated_tickers keeps the
+    input order with corrected symbols substituted and invalid ones
+    dropped.
+    """
+    tickers = list(tickers)
+    if not tickers:
+        return [], []
+
+    valid = set()
+    try:
+        valid = _probe_tickers(tickers)
+    except Exception as e:
+        print(f"Warning: batched validation probe failed: {e}")
+
+    failed = [t for t in tickers if t not in valid]
+    corrections = {}
+    messages = []
+    if failed:
+        # Probe every failed ticker's suffix variants in one more bulk call
+        variant_map = {t: _ticker_variants(t) for t in failed}
+        all_variants = list(dict.fromkeys(v for vs in variant_map.values() for v in vs))
+        found = set()
+        try:
+            found = _probe_tickers(all_variants)
+        except Exception as e:
+            print(f"Warning: variant validation probe failed: {e}")
+        for ticker in failed:
+            corrected = next((v for v in variant_map[ticker] if v in found), None)
+            if corrected is not None:
+                corrections[ticker] = corrected
+                messages.append(f"Ticker corrected from {ticker} to {corrected}")
+            else:
+                messages.append(f"No valid data found for {ticker} or common variations")
+
+    validated = [corrections.get(t, t) for t in tickers if t in valid or t in corrections]
+    return validated, messages
+
+def get_close_panel(data, tickers=None):
+    """Return a (dates x tickers) Close panel from any download_data shape.
+
+    Handles the cached dict-of-frames, a field-first frame (yfinance
+    default, data['Close'] is already 2D), a ticker-first MultiIndex frame
+    and a plain single-ticker frame.
+    """
+    if isinstance(data, dict):
+        wanted = tickers if tickers is not None else list(data.keys())
+        panel = pd.DataFrame({t: data[t]['Close'] for t in wanted if t in data})
+    elif isinstance(data.columns, pd.MultiIndex):
+        if 'Close' in data.columns.get_level_values(0):
+            panel = data['Close']  # field-first
+        else:
+            panel = data.xs('Close', axis=1, level=1)  # ticker-first
+    else:
+        panel = data[['Close']]
+    if tickers is not None:
+        panel = panel[[t for t in tickers if t in panel.columns]]
+    return panel
+
+@functools.lru_cache(maxsize=None)
 def read_tickers(file_path):
-    """Read ticker symbols from a file."""
-    with open(file_path) as f:
-        return [line.strip() for line in f if line.strip()]
+    """Read ticker symbols from a file (memoized, so repeat calls are free)."""
+    lines = Path(file_path).read_text().splitlines()
+    return [line.strip() for line in lines if line.strip()]
 
 def load_assets_and_currencies():
     """Load asset and currency lists from config files with validation."""
     assets = read_tickers(ASSETS_FILE)
     currencies = read_tickers(CURRENCIES_FILE)
 
-    # Optional: Validate tickers (uncomment to enable)
-    # print("Validating tickers...")
-    # validated_assets = []
-    # for ticker in assets:
-    #     is_valid, corrected_ticker, message = validate_ticker(ticker)
-    #     if is_valid:
-    #         validated_assets.append(corrected_ticker)
-    #         if message:
-    #             print(f"  {message}")
-    #     else:
-    #         print(f"  Warning: {message}")
-    # assets = validated_assets
+    # Optional startup validation: one batched probe instead of a
+    # download per ticker (enable via VALIDATE_TICKERS in config.py)
+    if VALIDATE_TICKERS:
+        print("Validating tickers...")
+        assets, messages = validate_tickers(assets)
+        for message in messages:
+            print(f"  {message}")
 
     return assets, currencies
 
-def download_data(tickers, period='15mo', interval='1d', use_cache=True):
+def download_data(tickers, period='15mo', interval='1d', use_cache=True, threads=None):
     """
     Enhanced download function with caching support.
 
@@ -735,15 +1301,21 @@ def download_data(tickers, period='15mo', interval='1d', use_cache=True):
         period: Time period for initial download
         interval: '1d' for daily, '1h' for hourly
         use_cache: Whether to use SQLite caching
+        threads: Worker count for direct downloads; defaults to scaling
+                 with the ticker-list size instead of yfinance's default
     """
     if not use_cache:
-        # Original behavior - direct download
+        # Direct download. Field-first column grouping (the yfinance
+        # default) so data['Close'] is one (dates x tickers) frame ready
+        # for vectorized indicator math instead of per-ticker .xs slicing.
+        if threads is None:
+            n_tickers = 1 if isinstance(tickers, str) else len(tickers)
+            threads = max(8, n_tickers // 4)
         return yf.download(
             tickers,
             period=period,
             interval=interval,
-            group_by='ticker',
-            threads=True,
+            threads=threads,
             auto_adjust=True
         )
 
@@ -755,36 +1327,93 @@ def download_data(tickers, period='15mo', interval='1d', use_cache=True):
         single_ticker = False
         ticker_list = list(tickers)  # Ensure it's a list
 
+    # Fast path: reuse a fresh parquet snapshot of this exact batch
+    cache_path = _batch_cache_path(ticker_list, period, interval)
+    if CACHE_ENABLED and not single_ticker:
+        cached = load_batch_cache(cache_path, interval)
+        if cached is not None:
+            print(f"Using batch cache for {len(cached)} tickers ({cache_path})")
+            return cached
+
     all_data = {}
     failed_tickers = []
 
-    for ticker in ticker_list:
-        try:
-            if interval == '1d':
-                data = download_incremental_daily_data(ticker, period)
-            elif interval == '1h':
-                # For hourly, extract hours from period (default to 24h)
-                hours = 24
-                if period.endswith('d'):
-                    hours = int(period[:-1]) * 24
-                elif period.endswith('h'):
-                    hours = int(period[:-1])
-                data = download_incremental_hourly_data(ticker, hours)
-            else:
-                # Fallback to direct download for other intervals
-                print(f"Using direct download for {ticker} with interval {interval}")
-                data = yf.download(ticker, period=period, interval=interval, auto_adjust=True)
-
-            if not data.empty:
-                all_data[ticker] = data
-                print(f"✓ Successfully loaded {ticker}: {data.shape[0]} records")
-            else:
-                failed_tickers.append(ticker)
-                print(f"✗ No data available for {ticker}")
-
-        except Exception as e:
-            print(f"✗ Error processing {ticker}: {e}")
-            failed_tickers.append(ticker)
+    # Preload every last-update timestamp in one query rather than one
+    # metadata SELECT per ticker inside the incremental functions
+    ensure_db_exists()
+    last_updates = get_all_last_updates('daily' if interval == '1d' else 'hourly')
+
+    # Tickers with no cached history have no incremental window, so fetch
+    # them all in one multi-ticker call (yfinance threads it internally)
+    # and leave only the short incremental updates to the per-ticker pool
+    if interval == '1d' and not single_ticker:
+        first_time = [t for t in ticker_list if t not in last_updates]
+        if len(first_time) > 1:
+            print(f"First time downloading {len(first_time)} tickers daily data ({period})")
+            try:
+                bulk = yf.download(first_time, period=period, interval='1d',
+                                   group_by='ticker', threads=True, auto_adjust=True)
+                for ticker in first_time:
+                    try:
+                        frame = bulk[ticker].dropna(how='all')
+                    except KeyError:
+                        continue
+                    if frame.empty:
+                        continue
+                    save_daily_data(ticker, frame)
+                    formatted = format_yfinance_data(frame)
+                    if not formatted.empty:
+                        all_data[ticker] = formatted
+                        print(f"✓ Successfully loaded {ticker}: {formatted.shape[0]} records")
+            except Exception as e:
+                print(f"Warning: bulk first-time download failed: {e}")
+
+    # Anything the bulk call could not resolve retries per ticker below
+    remaining = [t for t in ticker_list if t not in all_data]
+
+    def _fetch_one(ticker):
+        if interval == '1d':
+            return download_incremental_daily_data(ticker, period, last_updates=last_updates)
+        elif interval == '1h':
+            # For hourly, extract hours from period (default to 24h)
+            hours = 24
+            if period.endswith('d'):
+                hours = int(period[:-1]) * 24
+            elif period.endswith('h'):
+                hours = int(period[:-1])
+            return download_incremental_hourly_data(ticker, hours, last_updates=last_updates)
+        else:
+            # Fallback to direct download for other intervals
+            print(f"Using direct download for {ticker} with interval {interval}")
+            return yf.download(ticker, period=period, interval=interval, auto_adjust=True)
+
+    # Fetch tickers concurrently; the network wait dominates, and all DB
+    # writes are serialized through the shared connection under _DB_LOCK.
+    if remaining:
+        with ThreadPoolExecutor(max_workers=min(16, len(remaining))) as executor:
+            future_to_ticker = {
+                executor.submit(_fetch_one, ticker): ticker
+                for ticker in remaining
+            }
+
+            for future in as_completed(future_to_ticker):
+                ticker = future_to_ticker[future]
+                try:
+                    data = future.result()
+
+                    if not data.empty:
+                        all_data[ticker] = data
+                        print(f"✓ Successfully loaded {ticker}: {data.shape[0]} records")
+                    else:
+                        failed_tickers.append(ticker)
+                        print(f"✗ No data available for {ticker}")
+
+                except Exception as e:
+                    print(f"✗ Error processing {ticker}: {e}")
+                    failed_tickers.append(ticker)
+
+    if interval == '1h' and AUTO_CLEANUP_HOURLY:
+        cleanup_old_hourly_data()
 
     if failed_tickers:
         print(f"Failed to get data for: {failed_tickers}")
@@ -803,4 +1432,6 @@ def download_data(tickers, period='15mo', interval='1d', use_cache=True):
             return {}  # Empty dict instead of None or empty DataFrame
         else:
             print(f"Successfully downloaded data for {len(all_data)} out of {len(ticker_list)} tickers")
+            if CACHE_ENABLED and not failed_tickers:
+                save_batch_cache(cache_path, all_data)
             return all_data
\ No newline at end of file
@@ -1,12 +1,37 @@
 # fx/fx_utils.py
+import functools
 import re
 
+import pandas as pd
+
+# Compiled once at import; is_fx sits on every ticker-classification path
+_FX_MATCH = re.compile(r'^[A-Z]{3}[A-Z]{3}=X$').match
+
+_CURRENCY_SET = frozenset({'USD', 'EUR', 'GBP'})
+
+def last_valid_close(series):
+    """Last non-NaN value of a series, or None if there is none.
+
+    Checks the final row first (the common case) instead of dropna()-scanning
+    the whole column just to read one value.
+    """
+    val = series.iat[-1]
+    if pd.isna(val):
+        idx = series.last_valid_index()
+        if idx is None:
+            return None
+        val = series.loc[idx]
+    return val
+
 def is_currency(ticker):
-    return ticker in ['USD', 'EUR', 'GBP']
+    return ticker in _CURRENCY_SET
 
 def is_fx(ticker):
-    return re.match(r'^[A-Z]{3}[A-Z]{3}=X$', ticker) is not None
+    return _FX_MATCH(ticker) is not None
 
+# Ticker -> classification is pure and the universe is small, so memoize;
+# these run several times per ticker across processing and reporting
+@functools.lru_cache(maxsize=None)
 def detect_currency(ticker):
     if is_currency(ticker):
         return ticker
@@ -20,6 +45,7 @@ def detect_currency(ticker):
         return 'GBP'
     return 'USD'
 
+@functools.lru_cache(maxsize=None)
 def infer_asset_class(ticker):
     if is_currency(ticker):
         return 'Currency'
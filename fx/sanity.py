@@ -1,9 +1,14 @@
 # fx/sanity.py
+from fx.fx_utils import last_valid_close
+
 def fx_sanity_check(data, fx_expected_ranges):
     print("\n=== FX Rate Sanity Check (last close) ===")
     for fx, rng in fx_expected_ranges.items():
         try:
-            val = data[fx]['Close'].dropna()[-1]
+            val = last_valid_close(data[fx]['Close'])
+            if val is None:
+                print(f"Could not check {fx}: no data")
+                continue
             print(f"{fx}: {val}")
             if not (rng[0] < val < rng[1]):
                 print(f"⚠️  Warning: {fx} out of expected range {rng}")
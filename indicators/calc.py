@@ -1,28 +1,192 @@
 # indicators/calc.py
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands
+import numpy as np
+import pandas as pd
+
+from config import USE_POLARS
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pandas ewm path
+    njit = None
+
+try:
+    import polars as pl
+except ImportError:  # polars is optional; panel math falls back to pandas
+    pl = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _wilder_rsi_jit(close, period):
+        n = close.size
+        out = np.full(n, np.nan)
+        if n <= period:
+            return out
+        gain = 0.0
+        loss = 0.0
+        for i in range(1, period + 1):
+            d = close[i] - close[i - 1]
+            gain += max(d, 0.0)
+            loss += max(-d, 0.0)
+        gain /= period
+        loss /= period
+        out[period] = 100.0 - 100.0 / (1.0 + gain / loss) if loss else 100.0
+        for i in range(period + 1, n):
+            d = close[i] - close[i - 1]
+            gain = (gain * (period - 1) + max(d, 0.0)) / period
+            loss = (loss * (period - 1) + max(-d, 0.0)) / period
+            out[i] = 100.0 - 100.0 / (1.0 + gain / loss) if loss else 100.0
+        return out
+
+    @njit(cache=True)
+    def _mean_std_jit(x):
+        n = x.size
+        m = 0.0
+        m2 = 0.0
+        for i in range(n):
+            d = x[i] - m
+            m += d / (i + 1)
+            m2 += d * (x[i] - m)
+        std = (m2 / (n - 1)) ** 0.5 if n > 1 else 0.0
+        return m, std
+
+def mean_std(x):
+    """Mean and sample std of a 1D array in a single Welford pass."""
+    arr = np.ascontiguousarray(x, dtype=np.float64)
+    if njit is not None:
+        return _mean_std_jit(arr)
+    return float(arr.mean()), float(arr.std(ddof=1)) if arr.size > 1 else 0.0
+
+def _wilder_rsi_ewm(close, period):
+    delta = pd.Series(close).diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    rs = gain / loss
+    return (100 - 100 / (1 + rs)).to_numpy()
+
+def wilder_rsi(close, period=14):
+    """Wilder RSI over a 1D float array.
+
+    Uses a Numba-JIT single forward pass (running avg gain/loss) when numba
+    is installed, otherwise the equivalent ewm formulation.
+    """
+    arr = np.ascontiguousarray(close, dtype=np.float64)
+    if njit is not None:
+        return _wilder_rsi_jit(arr, period)
+    return _wilder_rsi_ewm(arr, period)
 
 def compute_performance(series, periods):
+    """Percentage change over each configured offset, as one NumPy gather."""
+    arr = np.asarray(series, dtype=float)
+    offsets = np.fromiter(periods.values(), dtype=np.int64)
+    last = arr[-1]
+    valid = offsets < len(arr)
+    prev = arr[np.where(valid, -1 - offsets, -1)]
+    prev = np.where(valid & (prev != 0), prev, np.nan)
+    pct = 100 * (last - prev) / prev
+    return {name: None if np.isnan(p) else float(p) for name, p in zip(periods, pct)}
+
+def compute_performance_panel(closes_usd, periods):
+    """Compute performance for all tickers at once on a (dates x tickers) close panel.
+
+    Returns a dict of period name -> per-ticker Series, one pct_change pass per offset.
+    """
     result = {}
-    last = series[-1]
     for name, offset in periods.items():
-        if len(series) > offset:
-            prev = series[-1 - offset]
-            result[name] = 100 * (last - prev) / prev if prev else None
+        if len(closes_usd) > offset:
+            result[name] = closes_usd.pct_change(offset).iloc[-1] * 100
         else:
-            result[name] = None
+            result[name] = pd.Series(np.nan, index=closes_usd.columns)
     return result
 
+def _calculate_indicators_panel_polars(closes_usd):
+    """Polars port of the panel indicators; rolling/ewm expressions for all
+    tickers are evaluated multi-threaded by the Polars engine."""
+    tickers = list(closes_usd.columns)
+    exprs = []
+    for t in tickers:
+        c = pl.col(t)
+        delta = c.diff()
+        rs = (
+            delta.clip(lower_bound=0).ewm_mean(alpha=1 / 14, adjust=False)
+            / (-delta.clip(upper_bound=0)).ewm_mean(alpha=1 / 14, adjust=False)
+        )
+        exprs += [
+            c.rolling_mean(50).alias(t + '|ma50'),
+            c.rolling_mean(200).alias(t + '|ma200'),
+            c.rolling_mean(20).alias(t + '|mid20'),
+            c.rolling_std(20, ddof=0).alias(t + '|std20'),
+            (100 - 100 / (1 + rs)).alias(t + '|rsi'),
+        ]
+    tail = pl.from_pandas(closes_usd[tickers]).lazy().with_columns(exprs).tail(1).collect()
+
+    def metric(name):
+        return pd.Series({t: tail[t + '|' + name][0] for t in tickers}, dtype=float)
+
+    last = closes_usd.iloc[-1]
+    ma50, ma200 = metric('ma50'), metric('ma200')
+    mid20, std20 = metric('mid20'), metric('std20')
+    enough = closes_usd.notna().sum() >= 200
+    return {
+        'RSI': metric('rsi').where(enough),
+        'BB_Upper': (mid20 + 2 * std20).where(enough),
+        'BB_Lower': (mid20 - 2 * std20).where(enough),
+        '%FromMA50': (100 * (last - ma50) / ma50).where(enough),
+        '%FromMA200': (100 * (last - ma200) / ma200).where(enough),
+    }
+
+def calculate_indicators_panel(closes_usd):
+    """Vectorized version of calculate_indicators over a (dates x tickers) close panel.
+
+    Computes RSI (Wilder, via ewm), Bollinger Bands and MA distances for all
+    tickers in single rolling passes. Expects each column's closes to be
+    contiguous (leading NaNs only, as built by process_assets), so the
+    fewer-than-200-closes guard counts real observations and matches the
+    per-series guard in calculate_indicators.
+    With USE_POLARS set (and polars installed) the rolling work runs on the
+    multi-threaded Polars engine instead.
+    """
+    if USE_POLARS and pl is not None:
+        return _calculate_indicators_panel_polars(closes_usd)
+
+    last = closes_usd.iloc[-1]
+
+    ma50 = closes_usd.rolling(window=50).mean().iloc[-1]
+    ma200 = closes_usd.rolling(window=200).mean().iloc[-1]
+    mid20 = closes_usd.rolling(window=20).mean().iloc[-1]
+    std20 = closes_usd.rolling(window=20).std(ddof=0).iloc[-1]
+
+    # Wilder RSI: EMA of gains/losses with alpha = 1/14
+    delta = closes_usd.diff()
+    gains = delta.clip(lower=0)
+    losses = -delta.clip(upper=0)
+    rs = gains.ewm(alpha=1 / 14, adjust=False).mean() / losses.ewm(alpha=1 / 14, adjust=False).mean()
+    rsi = (100 - 100 / (1 + rs)).iloc[-1]
+
+    enough = closes_usd.notna().sum() >= 200
+    return {
+        'RSI': rsi.where(enough),
+        'BB_Upper': (mid20 + 2 * std20).where(enough),
+        'BB_Lower': (mid20 - 2 * std20).where(enough),
+        '%FromMA50': (100 * (last - ma50) / ma50).where(enough),
+        '%FromMA200': (100 * (last - ma200) / ma200).where(enough),
+    }
+
 def calculate_indicators(series_usd):
     if len(series_usd) >= 200:
-        rsi = RSIIndicator(close=series_usd).rsi()[-1]
-        bb = BollingerBands(close=series_usd)
-        bb_upper = bb.bollinger_hband()[-1]
-        bb_lower = bb.bollinger_lband()[-1]
-        ma50 = series_usd.rolling(window=50).mean()[-1]
-        ma200 = series_usd.rolling(window=200).mean()[-1]
-        pct_from_ma50 = 100 * (series_usd[-1] - ma50) / ma50 if ma50 else None
-        pct_from_ma200 = 100 * (series_usd[-1] - ma200) / ma200 if ma200 else None
+        values = series_usd.to_numpy()
+        rsi = wilder_rsi(values)[-1]
+        # Only the trailing value of each rolling stat is reported, so
+        # reduce the window tails directly instead of full rolling passes
+        tail20 = values[-20:]
+        mid20 = tail20.mean()
+        std20 = tail20.std()  # population std, matching the Bollinger definition
+        bb_upper = mid20 + 2 * std20
+        bb_lower = mid20 - 2 * std20
+        ma50 = values[-50:].mean()
+        ma200 = values[-200:].mean()
+        last = values[-1]
+        pct_from_ma50 = 100 * (last - ma50) / ma50 if ma50 else None
+        pct_from_ma200 = 100 * (last - ma200) / ma200 if ma200 else None
     else:
         rsi = bb_upper = bb_lower = ma50 = ma200 = pct_from_ma50 = pct_from_ma200 = None
     return rsi, bb_upper, bb_lower, pct_from_ma50, pct_from_ma200
@@ -1,38 +1,38 @@
 # logic/alerts.py
-def strong_sell_alert(row):
-    return (
-        row['Z-score'] is not None and row['RSI'] is not None and row['%FromMA200'] is not None and row['1m'] is not None and row['3m'] is not None
-        and row['Z-score'] > 2
-        and row['RSI'] > 70
-        and row['%FromMA200'] > 20
-        and (row['1m'] > 10 or row['3m'] > 30)
-    )
+# Alert predicates as vectorized boolean masks over the whole asset table.
+# NaN comparisons evaluate to False, which matches the old per-row
+# `is not None` guards.
 
-def strong_buy_alert(row):
-    return (
-        row['Z-score'] is not None and row['RSI'] is not None and row['%FromMA200'] is not None and row['1y'] is not None
-        and row['Z-score'] < -2
-        and row['RSI'] < 35
-        and row['%FromMA200'] < -20
-        and row['1y'] < -20
-    )
+def strong_sell_alert(asset_df):
+    z = asset_df['Z-score']
+    rsi = asset_df['RSI']
+    ma200 = asset_df['%FromMA200']
+    m1, m3 = asset_df['1m'], asset_df['3m']
+    return (z > 2) & (rsi > 70) & (ma200 > 20) & ((m1 > 10) | (m3 > 30))
 
-def less_strong_sell_alert(row):
-    return (
-        row['Z-score'] is not None and row['RSI'] is not None and row['%FromMA200'] is not None
-        and row['Z-score'] > 1.5
-        and row['RSI'] > 65
-        and row['%FromMA200'] > 10
-        and ((row['1m'] is not None and row['1m'] > 5) or (row['3m'] is not None and row['3m'] > 15))
-        and not row.get('Strong Sell Alert', False)
-    )
+def strong_buy_alert(asset_df):
+    z = asset_df['Z-score']
+    rsi = asset_df['RSI']
+    ma200 = asset_df['%FromMA200']
+    y1 = asset_df['1y']
+    return (z < -2) & (rsi < 35) & (ma200 < -20) & (y1 < -20)
 
-def less_strong_buy_alert(row):
-    return (
-        row['Z-score'] is not None and row['RSI'] is not None and row['%FromMA200'] is not None and row['1y'] is not None
-        and row['Z-score'] < -1.5
-        and row['RSI'] < 40
-        and row['%FromMA200'] < -10
-        and row['1y'] < -10
-        and not row.get('Strong Buy Alert', False)
-    )
+def less_strong_sell_alert(asset_df):
+    z = asset_df['Z-score']
+    rsi = asset_df['RSI']
+    ma200 = asset_df['%FromMA200']
+    m1, m3 = asset_df['1m'], asset_df['3m']
+    mask = (z > 1.5) & (rsi > 65) & (ma200 > 10) & ((m1 > 5) | (m3 > 15))
+    if 'Strong Sell Alert' in asset_df.columns:
+        mask &= ~asset_df['Strong Sell Alert']
+    return mask
+
+def less_strong_buy_alert(asset_df):
+    z = asset_df['Z-score']
+    rsi = asset_df['RSI']
+    ma200 = asset_df['%FromMA200']
+    y1 = asset_df['1y']
+    mask = (z < -1.5) & (rsi < 40) & (ma200 < -10) & (y1 < -10)
+    if 'Strong Buy Alert' in asset_df.columns:
+        mask &= ~asset_df['Strong Buy Alert']
+    return mask
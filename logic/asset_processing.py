@@ -1,7 +1,125 @@
 # logic/asset_processing.py
+import numpy as np
 import pandas as pd
+from data.loader import get_close_panel
 from fx.fx_utils import detect_currency, is_currency, is_fx, infer_asset_class
-from indicators.calc import compute_performance, calculate_indicators
+from indicators.calc import (
+    compute_performance, calculate_indicators, mean_std,
+    compute_performance_panel, calculate_indicators_panel
+)
+
+def process_assets(tickers, data, fx_rates, performance_offsets, benchmark_perf,
+                   currency_map=None, class_map=None):
+    """Batch version of process_asset: one vectorized pass over all tickers.
+
+    Builds a single (dates x tickers) close panel, converts it to USD with one
+    multiply, then computes indicators, performance and Z-scores across all
+    columns at once instead of per-ticker rolling/RSI setup. Returns the
+    result table as a DataFrame assembled column-by-column (one array per
+    metric) rather than a list of per-ticker dicts. Callers that already
+    classified their tickers can pass currency_map / class_map to skip the
+    per-ticker string checks here.
+    """
+    if currency_map is None:
+        currency_map = {t: detect_currency(t) for t in tickers}
+    if class_map is None:
+        class_map = {t: infer_asset_class(t) for t in tickers}
+
+    # Field-first downloads already expose one 2D Close panel
+    panel = None if isinstance(data, dict) else get_close_panel(data)
+
+    closes = {}
+    for ticker in tickers:
+        try:
+            if panel is None:
+                series = data[ticker]['Close'].dropna()
+            else:
+                series = panel[ticker].dropna()
+        except Exception as e:
+            print(f"Error for {ticker}: {e}")
+            continue
+        if len(series) < 10:
+            print(f"Skipping {ticker}: not enough data")
+            continue
+        currency = currency_map[ticker]
+        if not is_fx(ticker) and not is_currency(ticker) and fx_rates.get(currency, 1.0) is None:
+            print(f"Error for {ticker}: FX rate unavailable for {currency}")
+            continue
+        closes[ticker] = series
+    if not closes:
+        return pd.DataFrame()
+
+    # float32 halves the bytes every rolling pass has to move; indicator
+    # precision is unaffected at alert-threshold granularity
+    closes = pd.DataFrame(closes).astype(np.float32)
+
+    # Convert all columns to USD in a single multiply. FX pairs stay as
+    # quoted and currencies become an identity (1.0) series, as in
+    # process_asset.
+    factors = pd.Series(
+        {t: 1.0 if is_fx(t) else fx_rates.get(currency_map[t], 1.0) for t in closes.columns}
+    )
+    usd = closes.mul(factors, axis=1)
+    for t in closes.columns:
+        if is_currency(t):
+            usd[t] = closes[t].where(closes[t].isna(), 1.0)
+
+    # Tickers trade on different calendars (7-day crypto vs 5-day equities),
+    # so the union index leaves per-ticker gaps. Forward-filling those gaps
+    # would let rolling windows and performance offsets span synthetic rows,
+    # shrinking an equity's 252-row lookback to ~8 calendar months. Instead
+    # compact each column to its own observed closes, aligned at the tail,
+    # so the window math sees exactly the values the per-series path sees.
+    values = usd.to_numpy()
+    valid = ~np.isnan(values)
+    # Stable argsort on the NaN mask pushes NaNs to the top of each column
+    # and keeps the closes below them in chronological order
+    order = np.argsort(valid, axis=0, kind='stable')
+    observed = pd.DataFrame(
+        np.take_along_axis(values, order, axis=0)[len(usd) - valid.sum(axis=0).max():],
+        columns=usd.columns,
+    )
+    last = observed.iloc[-1]
+
+    mean = usd.mean()
+    std = usd.std()
+    z_scores = ((last - mean) / std).where(std != 0, 0.0)
+    fx_cols = [t for t in closes.columns if is_fx(t)]
+    z_scores[fx_cols] = -z_scores[fx_cols]
+
+    perf = compute_performance_panel(observed, performance_offsets)
+    indicators = calculate_indicators_panel(observed)
+
+    # Identity (constant 1.0) currency series carry no indicator signal
+    ccy_cols = [t for t in closes.columns if is_currency(t)]
+    if ccy_cols:
+        for key in indicators:
+            indicators[key][ccy_cols] = np.nan
+
+    # Assemble the table column-by-column (SoA): one contiguous array per
+    # metric instead of N per-ticker dicts reboxed by the DataFrame ctor.
+    n = len(closes.columns)
+    columns = {
+        'Ticker': list(closes.columns),
+        'Asset Class': [class_map[t] for t in closes.columns],
+        'Currency': [currency_map[t] for t in closes.columns],
+        'Price_USD': last.to_numpy(),
+        'Z-score': z_scores.to_numpy(),
+        'RSI': indicators['RSI'].to_numpy(),
+        'BB_Upper': indicators['BB_Upper'].to_numpy(),
+        'BB_Lower': indicators['BB_Lower'].to_numpy(),
+        '%FromMA50': indicators['%FromMA50'].to_numpy(),
+        '%FromMA200': indicators['%FromMA200'].to_numpy(),
+    }
+    for period in performance_offsets.keys():
+        columns[period] = perf[period].to_numpy()
+    for period in performance_offsets.keys():
+        bench_perf = benchmark_perf[period]
+        if bench_perf is not None:
+            columns[period + '_RS'] = columns[period] - bench_perf
+        else:
+            columns[period + '_RS'] = np.full(n, np.nan)
+    return pd.DataFrame(columns)
 
 def process_asset(
     ticker, data, fx_rates, performance_offsets, benchmark_perf
@@ -17,19 +135,23 @@ def process_asset(
         if is_fx(ticker):
             series_usd = series
         elif is_currency(ticker):
-            series_usd = pd.Series([1.0]*len(series), index=series.index)
+            series_usd = pd.Series(np.ones(len(series)), index=series.index)
         else:
             series_usd = series * fx_rate
 
-        price_usd = series_usd[-1]
-        mean = series_usd.mean()
-        std = series_usd.std()
+        price_usd = series_usd.iat[-1]
+        mean, std = mean_std(series_usd.values)
         z_score = (price_usd - mean) / std if std else 0
         if is_fx(ticker):
             z_score = -z_score
 
         perf = compute_performance(series_usd, performance_offsets)
-        rsi, bb_upper, bb_lower, pct_from_ma50, pct_from_ma200 = calculate_indicators(series_usd)
+        if is_currency(ticker):
+            # Identity series: RSI/BB/MA are all constants or undefined,
+            # no point running the indicator block on it
+            rsi = bb_upper = bb_lower = pct_from_ma50 = pct_from_ma200 = None
+        else:
+            rsi, bb_upper, bb_lower, pct_from_ma50, pct_from_ma200 = calculate_indicators(series_usd)
 
         relative_perf = {}
         for period in performance_offsets.keys():
@@ -3,11 +3,10 @@ def rebalance_trades(asset_df, top_n=3):
     df_rebalance = asset_df[~asset_df['Asset Class'].isin(['Currency', 'FX'])]
     most_overvalued = df_rebalance.head(top_n)
     most_undervalued = df_rebalance.tail(top_n).sort_values('Z-score')
-    trades = []
-    for i in range(min(top_n, len(most_overvalued), len(most_undervalued))):
-        sell = most_overvalued.iloc[i]
-        buy = most_undervalued.iloc[i]
-        trades.append(
-            (sell['Ticker'], sell['Z-score'], buy['Ticker'], buy['Z-score'], sell['Z-score'] - buy['Z-score'])
-        )
-    return trades
+    # Pair the extremes as column arrays instead of materializing rows
+    k = min(top_n, len(most_overvalued), len(most_undervalued))
+    sell_tickers = most_overvalued['Ticker'].to_numpy()[:k]
+    sell_z = most_overvalued['Z-score'].to_numpy()[:k]
+    buy_tickers = most_undervalued['Ticker'].to_numpy()[:k]
+    buy_z = most_undervalued['Z-score'].to_numpy()[:k]
+    return list(zip(sell_tickers, sell_z, buy_tickers, buy_z, sell_z - buy_z))
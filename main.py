@@ -3,22 +3,24 @@
 Asset Valuation Analyzer - Portfolio analysis with technical indicators and alerts.
 Generates console output and modern HTML reports with interactive filtering.
 """
+import sys
+
 import pandas as pd
 
 from config import *
 from data.loader import load_assets_and_currencies, download_data
 from fx.sanity import fx_sanity_check
-from fx.fx_utils import is_currency, is_fx, detect_currency
+from fx.fx_utils import is_currency, is_fx, detect_currency, infer_asset_class, last_valid_close
 from indicators.calc import compute_performance
-from logic.asset_processing import process_asset
+from logic.asset_processing import process_assets
 from logic.alerts import (
     strong_sell_alert, strong_buy_alert,
     less_strong_sell_alert, less_strong_buy_alert
 )
 from output.report import (
-    print_asset_table, print_alerts, print_rebalance,  # Original console functions
-    print_asset_table_modern, print_alerts_modern,     # Modern HTML reports
-    create_interactive_dashboard                        # Interactive web dashboard
+    render_asset_table, render_alerts, render_rebalance,  # Console sections
+    print_asset_table_modern, print_alerts_modern,         # Modern HTML reports
+    create_interactive_dashboard                            # Interactive web dashboard
 )
 from logic.rebalance import rebalance_trades
 
@@ -30,6 +32,10 @@ def main():
     assets, currencies = load_assets_and_currencies()
     tickers = assets + currencies
 
+    # Classify every ticker exactly once; both processing passes reuse these
+    currency_map = {t: detect_currency(t) for t in tickers}
+    class_map = {t: infer_asset_class(t) for t in tickers}
+
     # Build FX mapping for USD normalization
     unique_currencies = set()
     for c in currencies:
@@ -68,48 +74,45 @@ def main():
             fx_rates[currency] = 1.0  # USD base case
         else:
             try:
-                fx_series = data[fx_ticker]['Close'].dropna()
-                fx_rates[currency] = fx_series[-1]  # Latest rate
+                fx_rates[currency] = last_valid_close(data[fx_ticker]['Close'])  # Latest rate
             except:
                 fx_rates[currency] = None
+            if fx_rates[currency] is None:
                 print(f"FX rate unavailable for {currency} via {fx_ticker}")
 
-    # Process assets with technical indicators
-    results = []
-    for ticker in assets:
-        row = process_asset(ticker, data, fx_rates, PERFORMANCE_OFFSETS, benchmark_perf)
-        if row:
-            results.append(row)
-    asset_df = pd.DataFrame(results).sort_values('Z-score', ascending=False)  # Most overvalued first
-
-    # Process currencies separately
-    results = []
-    for ticker in currencies:
-        row = process_asset(ticker, data, fx_rates, PERFORMANCE_OFFSETS, benchmark_perf)
-        if row:
-            results.append(row)
-    currency_df = pd.DataFrame(results).sort_values('Z-score', ascending=False)
+    # Process assets and currencies in one vectorized pass so the panel
+    # work (USD conversion, rolling indicators) runs once, then split
+    full_df = process_assets(
+        tickers, data, fx_rates, PERFORMANCE_OFFSETS, benchmark_perf,
+        currency_map=currency_map, class_map=class_map
+    ).sort_values('Z-score', ascending=False, kind='stable',
+                  ignore_index=True)  # Most overvalued first
+
+    in_assets = full_df['Ticker'].isin(assets)
+    asset_df = full_df[in_assets].reset_index(drop=True)
+    currency_df = full_df[~in_assets].reset_index(drop=True)
 
     # Format console output
     pd.set_option('display.float_format', '{:,.2f}'.format)
 
-    # Console output
-    print_asset_table(asset_df)
+    # Render every console section, then write stdout once at the end
+    sections = [render_asset_table(asset_df)]
 
-    # Generate trading alerts based on statistical thresholds
-    asset_df['Strong Sell Alert'] = asset_df.apply(strong_sell_alert, axis=1)
-    asset_df['Strong Buy Alert'] = asset_df.apply(strong_buy_alert, axis=1)
-    asset_df['Less Strong Sell Alert'] = asset_df.apply(less_strong_sell_alert, axis=1)
-    asset_df['Less Strong Buy Alert'] = asset_df.apply(less_strong_buy_alert, axis=1)
+    # Generate trading alerts based on statistical thresholds (vectorized masks)
+    asset_df['Strong Sell Alert'] = strong_sell_alert(asset_df)
+    asset_df['Strong Buy Alert'] = strong_buy_alert(asset_df)
+    asset_df['Less Strong Sell Alert'] = less_strong_sell_alert(asset_df)
+    asset_df['Less Strong Buy Alert'] = less_strong_buy_alert(asset_df)
 
-    print_alerts(asset_df)
+    sections.append(render_alerts(asset_df))
 
-    print("\n=== Currencies / FX ===")
-    print(currency_df.to_string(index=False))
+    sections.append("\n=== Currencies / FX ===\n" + currency_df.to_string(index=False))
 
     # Generate rebalancing recommendations
     trades = rebalance_trades(asset_df, top_n=3)
-    print_rebalance(trades)
+    sections.append(render_rebalance(trades))
+
+    sys.stdout.write("\n".join(sections) + "\n")
 
     # Generate modern HTML reports with interactive features
     print("\n" + "="*60)
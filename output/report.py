@@ -1,4 +1,8 @@
 # output/report.py
+import hashlib
+import re
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -85,51 +89,75 @@ def filter_dataframe(df, symbol_filter=None, type_filter=None, name_filter=None)
     if df.empty:
         return df
 
-    filtered_df = df.copy()
+    # No copy up front: boolean indexing below already yields new frames
+    # and this function never mutates, so an unfiltered call returns df
+    filtered_df = df
 
+    # Compile each filter once as a literal, case-insensitive pattern so
+    # str.contains does not rebuild a regex per column pass
     # Filter by symbol
     if symbol_filter:
+        pattern = re.compile(re.escape(symbol_filter), re.IGNORECASE)
         if 'Ticker' in filtered_df.columns:
-            mask = filtered_df['Ticker'].str.contains(symbol_filter, case=False, na=False)
+            mask = filtered_df['Ticker'].str.contains(pattern, na=False)
             filtered_df = filtered_df[mask]
         elif filtered_df.index.name == 'Ticker':
-            mask = filtered_df.index.str.contains(symbol_filter, case=False, na=False)
+            mask = filtered_df.index.str.contains(pattern, na=False)
             filtered_df = filtered_df[mask]
 
     # Filter by name
     if name_filter:
+        pattern = re.compile(re.escape(name_filter), re.IGNORECASE)
         if 'Name' in filtered_df.columns:
-            mask = filtered_df['Name'].str.contains(name_filter, case=False, na=False)
+            mask = filtered_df['Name'].str.contains(pattern, na=False)
             filtered_df = filtered_df[mask]
 
     # Filter by type
     if type_filter:
+        pattern = re.compile(re.escape(type_filter), re.IGNORECASE)
         if 'Asset Class' in filtered_df.columns:
-            mask = filtered_df['Asset Class'].str.contains(type_filter, case=False, na=False)
+            mask = filtered_df['Asset Class'].str.contains(pattern, na=False)
             filtered_df = filtered_df[mask]
         elif 'Type' in filtered_df.columns:
-            mask = filtered_df['Type'].str.contains(type_filter, case=False, na=False)
+            mask = filtered_df['Type'].str.contains(pattern, na=False)
             filtered_df = filtered_df[mask]
 
     return filtered_df
 
+# Rendered pages keyed by (frame hash, title, filters); repeated exports
+# of an unchanged table skip the whole rebuild
+_HTML_CACHE = {}
+_HTML_CACHE_MAX = 16
+
+def _df_cache_key(df):
+    """Stable content hash of a DataFrame for the render cache."""
+    return hashlib.blake2b(
+        pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes(),
+        digest_size=16,
+    ).hexdigest()
+
 def create_ib_style_html_table(df, title, output_file=None, symbol_filter=None, type_filter=None, name_filter=None):
     """Create an Interactive Brokers-style professional trading table with interactive filters"""
 
     # Ensure names are present (fallback if not provided by model)
     df = add_names_to_dataframe(df)
 
-    # Store original data for client-side filtering
-    original_data = []
-    for _, row in df.iterrows():
-        row_dict = {}
-        for col in df.columns:
-            value = row[col]
-            if pd.isna(value):
-                row_dict[col] = ''
-            else:
-                row_dict[col] = str(value)
-        original_data.append(row_dict)
+    cache_key = (_df_cache_key(df), title, symbol_filter, type_filter, name_filter)
+    cached = _HTML_CACHE.get(cache_key)
+    if cached is not None:
+        if output_file:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(cached)
+            print(f"Professional trading-style HTML report with interactive filters generated: {output_file}")
+        return cached
+
+    # Store original data for client-side filtering. The embedded JS only
+    # reads Ticker/Name/Asset Class, so just those columns go in, as one
+    # list per column instead of a dict per row.
+    original_data = {
+        col: df[col].fillna('').astype(str).tolist()
+        for col in ('Ticker', 'Name', 'Asset Class') if col in df.columns
+    }
 
     # Apply server-side filters if provided
     filtered_df = filter_dataframe(df, symbol_filter, type_filter, name_filter)
@@ -146,63 +174,41 @@ def create_ib_style_html_table(df, title, output_file=None, symbol_filter=None,
     if filter_parts:
         title += f" (Filtered: {', '.join(filter_parts)})"
 
-    # Prepare data with colors
-    table_data = []
-    for _, row in filtered_df.iterrows():
-        row_data = {}
-        for col in filtered_df.columns:
-            value = row[col]
-            if pd.isna(value):
-                row_data[col] = {'value': '--', 'color': '#666666', 'bg': '#f8f9fa'}
-            elif col in ['24h', '7d', '1m', '3m', '1y', '%FromMA50', '%FromMA200', '24h_RS', '7d_RS', '1m_RS', '3m_RS', '1y_RS']:
-                color = get_color_for_percentage(value)
-                bg_color = '#f0f8f0' if value >= 0 else '#fff0f0'
-                row_data[col] = {
-                    'value': f"{value:+.2f}%" if pd.notna(value) else '--',
-                    'color': color,
-                    'bg': bg_color
-                }
-            elif col == 'RSI':
-                color = get_color_for_rsi(value)
-                row_data[col] = {
-                    'value': f"{value:.1f}" if pd.notna(value) else '--',
-                    'color': color,
-                    'bg': '#f8f9fa'
-                }
-            elif col == 'Z-score':
-                color = '#FF4444' if abs(value) > 2 else '#FFA500' if abs(value) > 1 else '#666666'
-                row_data[col] = {
-                    'value': f"{value:+.2f}" if pd.notna(value) else '--',
-                    'color': color,
-                    'bg': '#f8f9fa'
-                }
-            elif col == 'Price_USD':
-                row_data[col] = {
-                    'value': f"${value:,.2f}" if pd.notna(value) else '--',
-                    'color': '#000000',
-                    'bg': '#ffffff'
-                }
-            elif 'Alert' in col:
-                row_data[col] = {
-                    'value': 'ALERT' if value else '',
-                    'color': '#FFFFFF' if value else '#666666',
-                    'bg': '#FF4444' if value else '#f8f9fa'
-                }
-            elif col == 'Name':
-                row_data[col] = {
-                    'value': str(value) if pd.notna(value) else '--',
-                    'color': '#333333',
-                    'bg': '#ffffff'
-                }
-            else:
-                row_data[col] = {
-                    'value': f"{value:.2f}" if isinstance(value, (int, float)) and pd.notna(value) else str(value),
-                    'color': '#000000',
-                    'bg': '#ffffff'
-                }
-        table_data.append(row_data)
+    # Classify colors and format cell text column-at-a-time; the row loop
+    # below only indexes these arrays instead of re-branching and
+    # re-formatting per cell. NaN cells never read them (they take the
+    # '--' branch first).
+    pct_cols = ['24h', '7d', '1m', '3m', '1y', '%FromMA50', '%FromMA200',
+                '24h_RS', '7d_RS', '1m_RS', '3m_RS', '1y_RS']
+    col_colors = {}
+    col_bgs = {}
+    col_texts = {}
+    for col in filtered_df.columns:
+        if col in pct_cols:
+            vals = filtered_df[col].to_numpy(dtype='float64')
+            col_colors[col] = np.select(
+                [vals >= 0, vals >= -5], ['#00C851', '#FF4444'], '#CC0000')
+            col_bgs[col] = np.where(vals >= 0, '#f0f8f0', '#fff0f0')
+            col_texts[col] = filtered_df[col].map('{:+.2f}%'.format).tolist()
+        elif col == 'RSI':
+            vals = filtered_df[col].to_numpy(dtype='float64')
+            col_colors[col] = np.select(
+                [vals >= 70, vals >= 50, vals >= 30],
+                ['#FF4444', '#FFA500', '#666666'], '#00C851')
+            col_texts[col] = filtered_df[col].map('{:.1f}'.format).tolist()
+        elif col == 'Z-score':
+            absvals = np.abs(filtered_df[col].to_numpy(dtype='float64'))
+            col_colors[col] = np.select(
+                [absvals > 2, absvals > 1], ['#FF4444', '#FFA500'], '#666666')
+            col_texts[col] = filtered_df[col].map('{:+.2f}'.format).tolist()
+        elif col == 'Price_USD':
+            col_texts[col] = filtered_df[col].map('${:,.2f}'.format).tolist()
+
+    col_idx = {col: i for i, col in enumerate(filtered_df.columns)}
 
-    html_content = f"""
+    # Build the page as a list of fragments joined once at the end;
+    # repeated += on a growing string reallocates quadratically
+    html_parts = [f"""
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -564,22 +570,21 @@ def create_ib_style_html_table(df, title, output_file=None, symbol_filter=None,
                 let visibleCount = 0;
                 
                 allRows.forEach((row, index) => {{
-                    const rowData = originalData[index];
                     let showRow = true;
-                    
+
                     // Apply symbol filter
-                    if (symbolFilter && rowData.Ticker) {{
-                        showRow = showRow && rowData.Ticker.toLowerCase().includes(symbolFilter);
+                    if (symbolFilter && originalData.Ticker) {{
+                        showRow = showRow && originalData.Ticker[index].toLowerCase().includes(symbolFilter);
                     }}
-                    
+
                     // Apply name filter
-                    if (nameFilter && rowData.Name) {{
-                        showRow = showRow && rowData.Name.toLowerCase().includes(nameFilter);
+                    if (nameFilter && originalData.Name) {{
+                        showRow = showRow && originalData.Name[index].toLowerCase().includes(nameFilter);
                     }}
-                    
+
                     // Apply type filter
                     if (typeFilter) {{
-                        const assetClass = rowData['Asset Class'] || '';
+                        const assetClass = (originalData['Asset Class'] || [])[index] || '';
                         showRow = showRow && assetClass.toLowerCase().includes(typeFilter);
                     }}
                     
@@ -601,7 +606,7 @@ def create_ib_style_html_table(df, title, output_file=None, symbol_filter=None,
                     if (nameFilter) filters.push(`Name contains: "${{nameFilter}}"`);
                     if (typeFilter) filters.push(`Type contains: "${{typeFilter}}"`);
                     
-                    filterInfo.innerHTML = `<strong>Active Filters:</strong> ${{filters.join(', ')}} | Showing ${{visibleCount}} of ${{originalData.length}} assets`;
+                    filterInfo.innerHTML = `<strong>Active Filters:</strong> ${{filters.join(', ')}} | Showing ${{visibleCount}} of ${{allRows.length}} assets`;
                     filterInfo.style.display = 'block';
                 }} else {{
                     filterInfo.style.display = 'none';
@@ -714,7 +719,7 @@ def create_ib_style_html_table(df, title, output_file=None, symbol_filter=None,
                 <table class="ib-table">
                     <thead>
                         <tr>
-    """
+    """]
 
     # Add headers with appropriate icons and formatting
     column_index = 0
@@ -737,46 +742,70 @@ def create_ib_style_html_table(df, title, output_file=None, symbol_filter=None,
         elif col in ['24h_RS', '7d_RS', '1m_RS', '3m_RS', '1y_RS']:
             header_name = col.upper().replace('_', ' ')
 
-        html_content += f'<th onclick="sortTable({column_index}, \'{col}\')">{header_name}</th>'
+        html_parts.append(f'<th onclick="sortTable({column_index}, \'{col}\')">{header_name}</th>')
         column_index += 1
 
-    html_content += """
+    html_parts.append("""
                         </tr>
                     </thead>
                     <tbody>
-    """
+    """)
 
-    # Add rows with professional styling
-    for row_data in table_data:
-        html_content += '<tr>'
+    # Resolve each column's CSS handling once instead of per cell; only
+    # alert and percentage classes still depend on the cell value
+    fixed_classes = {'Ticker': 'ticker-cell', 'Name': 'name-cell', 'Price_USD': 'price-cell'}
+    col_kind = {}
+    for col in filtered_df.columns:
+        if 'Alert' in col:
+            col_kind[col] = 'alert'
+        elif col in pct_cols:
+            col_kind[col] = 'pct'
+        else:
+            col_kind[col] = fixed_classes.get(col, '')
+
+    # Add rows with professional styling: one fused pass writes the <td>
+    # strings directly from the precomputed color/text arrays, with no
+    # intermediate per-cell dicts
+    for i, row in enumerate(filtered_df.itertuples(index=False, name=None)):
+        html_parts.append('<tr>')
         for col in filtered_df.columns:
-            cell_data = row_data[col]
-            value = cell_data['value']
-            color = cell_data['color']
-            bg_color = cell_data.get('bg', '#ffffff')
-
-            css_class = ""
-            if 'Alert' in col and 'ALERT' in str(value):
-                css_class = "alert-cell"
-            elif col == 'Ticker':
-                css_class = "ticker-cell"
-            elif col == 'Name':
-                css_class = "name-cell"
-            elif col == 'Price_USD':
-                css_class = "price-cell"
-            elif col in ['24h', '7d', '1m', '3m', '1y', '%FromMA50', '%FromMA200', '24h_RS', '7d_RS', '1m_RS', '3m_RS', '1y_RS']:
-                if '+' in str(value):
-                    css_class = "positive"
-                elif '-' in str(value) and value != '--':
-                    css_class = "negative"
+            value = row[col_idx[col]]
+            kind = col_kind[col]
+            if pd.isna(value):
+                css_class = 'neutral' if kind == 'pct' else '' if kind == 'alert' else kind
+                html_parts.append(
+                    f'<td class="{css_class}" style="color: #666666; background-color: #f8f9fa;">--</td>')
+                continue
+            if kind == 'pct':
+                text = col_texts[col][i]
+                color = col_colors[col][i]
+                bg_color = col_bgs[col][i]
+                css_class = 'positive' if value >= 0 else 'negative'
+            elif col in ('RSI', 'Z-score'):
+                text = col_texts[col][i]
+                color = col_colors[col][i]
+                bg_color = '#f8f9fa'
+                css_class = ''
+            elif kind == 'alert':
+                if value:
+                    text, color, bg_color, css_class = 'ALERT', '#FFFFFF', '#FF4444', 'alert-cell'
                 else:
-                    css_class = "neutral"
+                    text, color, bg_color, css_class = '', '#666666', '#f8f9fa', ''
+            elif col == 'Price_USD':
+                text = col_texts[col][i]
+                color, bg_color, css_class = '#000000', '#ffffff', 'price-cell'
+            elif col == 'Name':
+                text = str(value)
+                color, bg_color, css_class = '#333333', '#ffffff', 'name-cell'
+            else:
+                text = f"{value:.2f}" if isinstance(value, (int, float)) else str(value)
+                color, bg_color, css_class = '#000000', '#ffffff', kind
 
             style = f"color: {color}; background-color: {bg_color};"
-            html_content += f'<td class="{css_class}" style="{style}">{value}</td>'
-        html_content += '</tr>'
+            html_parts.append(f'<td class="{css_class}" style="{style}">{text}</td>')
+        html_parts.append('</tr>')
 
-    html_content += f"""
+    html_parts.append(f"""
                     </tbody>
                 </table>
             </div>
@@ -789,7 +818,13 @@ def create_ib_style_html_table(df, title, output_file=None, symbol_filter=None,
         </div>
     </body>
     </html>
-    """
+    """)
+
+    html_content = "".join(html_parts)
+
+    if len(_HTML_CACHE) >= _HTML_CACHE_MAX:
+        _HTML_CACHE.pop(next(iter(_HTML_CACHE)))
+    _HTML_CACHE[cache_key] = html_content
 
     if output_file:
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -839,8 +874,13 @@ def create_ib_style_dash_app(df, title="Portfolio Management System"):
 
         columns.append(col_config)
 
-    # Prepare data
-    data = df.fillna('--').to_dict('records')
+    # Prepare data. Only object columns get the '--' placeholder: a
+    # whole-frame fillna('--') boxed every numeric cell into a Python
+    # object, bloating the serialized payload and disabling the
+    # DataTable's native numeric formatting. Numeric NaN serializes to
+    # null, which the table renders blank.
+    text_cols = [col for col in df.columns if pd.api.types.is_string_dtype(df[col])]
+    data = df.fillna({col: '--' for col in text_cols}).to_dict('records')
 
     # Create Dash app
     app = dash.Dash(__name__)
@@ -1194,25 +1234,47 @@ def print_alerts_modern(asset_df, output_file="professional_alerts_report.html")
     print(f"Professional alerts report generated: {output_file}")
     return alerts_html
 
+# Console sections are rendered to strings so callers can batch them into
+# a single stdout write instead of one flush per section
+def render_asset_table(asset_df):
+    return "\n=== All Assets (excluding currencies) ===\n" + asset_df.to_string(index=False)
+
+def render_alerts(asset_df):
+    # Pull each alert mask out once as a bool array; .iloc with it avoids
+    # re-reading the column for the .any() check and the slice
+    parts = ["\n=== STRONG SELL ALERTS (Overheated) ==="]
+    if 'Strong Sell Alert' in asset_df.columns:
+        ss_mask = asset_df['Strong Sell Alert'].to_numpy(dtype=bool)
+    else:
+        ss_mask = None
+    if ss_mask is not None and ss_mask.any():
+        parts.append(asset_df.iloc[ss_mask].to_string(index=False))
+    else:
+        parts.append("None found.")
+
+    parts.append("\n=== STRONG BUY ALERTS (Washed Out) ===")
+    if 'Strong Buy Alert' in asset_df.columns:
+        sb_mask = asset_df['Strong Buy Alert'].to_numpy(dtype=bool)
+    else:
+        sb_mask = None
+    if sb_mask is not None and sb_mask.any():
+        parts.append(asset_df.iloc[sb_mask].to_string(index=False))
+    else:
+        parts.append("None found.")
+    return "\n".join(parts)
+
+def render_rebalance(trades):
+    lines = ["\n=== Suggested Rebalance Trades (excluding currencies) ==="]
+    for sell, z_sell, buy, z_buy, delta_z in trades:
+        lines.append(f"SELL {sell} (Z={z_sell:.2f}) → BUY {buy} (Z={z_buy:.2f}) | ΔZ = {delta_z:.2f}")
+    return "\n".join(lines)
+
 # Keep original functions for backward compatibility
 def print_asset_table(asset_df):
-    print("\n=== All Assets (excluding currencies) ===")
-    print(asset_df.to_string(index=False))
+    print(render_asset_table(asset_df))
 
 def print_alerts(asset_df):
-    print("\n=== STRONG SELL ALERTS (Overheated) ===")
-    if 'Strong Sell Alert' in asset_df.columns and asset_df['Strong Sell Alert'].any():
-        print(asset_df[asset_df['Strong Sell Alert']].to_string(index=False))
-    else:
-        print("None found.")
-
-    print("\n=== STRONG BUY ALERTS (Washed Out) ===")
-    if 'Strong Buy Alert' in asset_df.columns and asset_df['Strong Buy Alert'].any():
-        print(asset_df[asset_df['Strong Buy Alert']].to_string(index=False))
-    else:
-        print("None found.")
+    print(render_alerts(asset_df))
 
 def print_rebalance(trades):
-    print("\n=== Suggested Rebalance Trades (excluding currencies) ===")
-    for sell, z_sell, buy, z_buy, delta_z in trades:
-        print(f"SELL {sell} (Z={z_sell:.2f}) → BUY {buy} (Z={z_buy:.2f}) | ΔZ = {delta_z:.2f}")
\ No newline at end of file
+    print(render_rebalance(trades))
\ No newline at end of file